@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+try:
+    import sage.all
+except ImportError:
+    import sage.all__sagemath_modules
+
+from sage.rings.complex_mpfr import ComplexField
+
+import numpy as np
+
+
+class BraidThread(object):
+    __slots__ = ["ts", "xs", "radii"]
+
+    def __init__(self, ts, xs, radii):
+        """A thread of a braid, given by the positions `xs` of a root at times `ts` (0=ts[0]<...<ts[-1]=1), linearly interpolated.
+
+        Positions are stored in double precision, and `radii[k]` bounds the distance between the root and the interpolated positions for times between ts[k] and ts[k+1].
+        """
+        self.ts = ts
+        self.xs = xs
+        self.radii = radii
+
+    @staticmethod
+    def from_points(points):
+        """Builds a BraidThread from a list of pairs [t, x], or of triples [t, x, r] where r bounds the distance between the root and the interpolated positions on the step ending at t, as given by `RootTracker.track`.
+        Without such bounds, the radii only account for the rounding of the positions to double precision."""
+        CC = ComplexField(53)
+        ts = np.array([float(p[0]) for p in points])
+        xs = np.array([complex(CC(p[1])) for p in points])
+        enclosures = np.array([float(p[2]) if len(p)>2 else 0 for p in points[1:]])
+        rounding = 2**-52 * np.maximum(np.abs(xs[:-1]), np.abs(xs[1:]))
+        return BraidThread(ts, xs, enclosures + rounding)
+
+    def reverse(self):
+        """The thread followed backwards."""
+        return BraidThread(1-self.ts[::-1], self.xs[::-1], self.radii[::-1])
+
+    def radius(self, t):
+        """The bound on the distance between the root and the interpolated positions at each time of an array t."""
+        return self.radii[np.clip(np.searchsorted(self.ts, t, side="right")-1, 0, len(self.radii)-1)]
+
+    def __call__(self, t):
+        """The position of the root at time t, or at each time of an array t."""
+        return np.interp(t, self.ts, self.xs)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, i):
+        return [self.ts[i], ComplexField(53)(self.xs[i])]
@@ -67,7 +67,7 @@ class CalabiYauOperator(object):
         self._L = L
         
         if basepoint!= None: # it is useful to be able to specify the basepoint to avoid being stuck in arithmetic computations if critical values have very large modulus
-            assert basepoint not in self.singular_values, "basepoint is not regular"
+            assert Util.index_of(basepoint, self.singular_values) == None, "basepoint is not regular"
             self._basepoint = basepoint
 
         if not self.ctx.debug:
@@ -85,19 +85,19 @@ class CalabiYauOperator(object):
     @property
     def basepoint(self):
         if not hasattr(self, "_basepoint"):
-            self._basepoint = QQ(10)**(min([floor(log(abs(r),10)) for r in self.singular_values if r!=0])-1)
+            self._basepoint = QQ(10)**(min([floor(log(abs(self.ctx.CF(r)),10)) for r in self.singular_values if r!=0])-1)
         return self._basepoint
    
     @property
     def singular_values(self):
         if not hasattr(self, "_singular_values"):
-            self._singular_values = self.L.leading_coefficient().roots(QQbar, multiplicities=False)
+            self._singular_values = Util.roots(self.L.leading_coefficient(), multiplicities=False)
         return self._singular_values
  
     @property
     def fundamental_group(self):
         if not hasattr(self, "_fundamental_group"):
-            fundamental_group = FundamentalGroupVoronoi(self.singular_values, self.basepoint)
+            fundamental_group = FundamentalGroupVoronoi(self.singular_values, self.basepoint, weight=self.ctx.path_weight)
             self._singular_values = [self._singular_values[i] for i in fundamental_group.sort_loops()]
             self._fundamental_group = fundamental_group
         return self._fundamental_group
@@ -113,7 +113,7 @@ class CalabiYauOperator(object):
     @property
     def transition_matrices(self):
         if not hasattr(self, "_transition_matrices"):
-            integrator = Integrator(self.fundamental_group, self.L, self.ctx.nbits)
+            integrator = Integrator(self.fundamental_group, self.L, self.ctx.nbits, target_digits=self.ctx.target_digits)
             transition_matrices = integrator.transition_matrices
             if self.L.annihilator_of_composition(1/self.L.base_ring().gen()).leading_coefficient()(0)==0:
                 transition_matrices += [prod(list(reversed(transition_matrices))).inverse()]
@@ -19,6 +19,8 @@
 from sage.rings.complex_arb import ComplexBallField
 from sage.rings.complex_mpfr import ComplexField
 from sage.rings.infinity import Infinity
+from sage.functions.other import ceil
+from sage.misc.functional import log
 
 class Context(object):
 
@@ -30,7 +32,11 @@ class Context(object):
             nbits=200,
             long_fibration=True,
             depth=0,
-            simultaneous_integration=True
+            simultaneous_integration=True,
+            target_digits=None,
+            monodromy_only=False,
+            elimination=None,
+            path_weight=None
         ):
         r"""
         Lefschetz Family integration context
@@ -40,6 +46,14 @@ class Context(object):
         * ``method`` -- The way the paths are computed, either along a Voronoi diagram of the singularities ("voronoi"), or a Delaunay triangulation of the singularities ("delaunay"). Default is "voronoi"
         * ``compute_periods`` -- Whether the algorithm should compute periods of the variety, or stop at homology. Default is True.
         * ``singular`` -- Whether the input variety is expected to be singular. Default is False
+        * ``nbits`` -- The working precision (in bits) of the numerical integration. Default is 200
+        * ``target_digits`` -- If set, the working precision of the integration is chosen automatically so that the transition matrices are recovered with at least this many decimal digits, in which case ``nbits`` is not used for integration. Default is None
+
+        * ``monodromy_only`` -- Whether only the monodromy matrices (and not the periods) are needed. If True, the transition matrices used for monodromy are integrated with the lowest precision that certifies their rounding to integers, up to ``nbits``. Default is False
+
+        * ``elimination`` -- The way the polynomial of critical values is computed, either with an elimination ideal over the rationals ("groebner"), or modulo several primes followed by rational reconstruction ("modular"). Default is "groebner"
+
+        * ``path_weight`` -- How edges of the Voronoi diagram are weighted when choosing the paths, either by their length ("length"), or by the predicted number of integration steps along them ("cost"). Default is "length"
 
         * (other options still to be documented...)
         """
@@ -48,6 +62,14 @@ class Context(object):
             raise ValueError("method", method)
         self.method = "voronoi" if method==None else method
 
+        if not elimination in [None, "groebner", "modular"]:
+            raise ValueError("elimination", elimination)
+        self.elimination = "groebner" if elimination==None else elimination
+
+        if not path_weight in [None, "length", "cost"]:
+            raise ValueError("path_weight", path_weight)
+        self.path_weight = "length" if path_weight==None else path_weight
+
         if not isinstance(singular, bool):
             raise TypeError("singular", type(singular))
         self.singular = singular
@@ -68,6 +90,14 @@ class Context(object):
         #     raise TypeError("nbits", type(nbits))
         self.nbits = nbits
 
+        if target_digits is not None and target_digits <= 0:
+            raise ValueError("target_digits", target_digits)
+        self.target_digits = target_digits
+
+        if not isinstance(monodromy_only, bool):
+            raise TypeError("monodromy_only", type(monodromy_only))
+        self.monodromy_only = monodromy_only
+
         if not isinstance(use_symmetry, bool):
             raise TypeError("use_symmetry", type(use_symmetry))
         self.use_symmetry = use_symmetry
@@ -76,8 +106,10 @@ class Context(object):
         #     raise TypeError("depth", type(depth))
         # self.depth = depth
 
-        self.CBF = ComplexBallField(4*nbits)
-        self.CF = ComplexField(4*nbits)
+        # in autotuning mode, the integration may end up running at a precision higher than nbits
+        prec = nbits if target_digits is None else max(nbits, ceil(target_digits*log(10, 2)))
+        self.CBF = ComplexBallField(4*prec)
+        self.CF = ComplexField(4*prec)
         self.depth = depth
         
         self.cutoff_simultaneous_integration = 2 if self.simultaneous_integration else Infinity
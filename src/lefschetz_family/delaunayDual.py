@@ -213,9 +213,7 @@ class FundamentalGroupDelaunayDual(object):
     def adapted_loops(self, subvoronoi): # This is broken.
         for v in subvoronoi.points:
             assert v in self.points
-        correspondance = []
-        for v in subvoronoi.vertices:
-            correspondance += [Util.select_closest_index(self.vertices,v)]
+        correspondance = Util.select_closest_indices(self.vertices, subvoronoi.vertices)
         adapted_loops = []
         for loop in subvoronoi.pointed_loops:
             adapted_loop = [correspondance[loop[0]]]
@@ -294,7 +292,7 @@ class FundamentalGroupDelaunayDual(object):
                         polygons_temp[v][1]+=[[edge, [v1,v2]]]
 
             # we are only interested in cells around elements of self.points
-            indices = [Util.select_closest_index([center for center, polygon in polygons_temp], c) for c in self.qpoints[1:]]
+            indices = Util.select_closest_indices([center for center, polygon in polygons_temp], self.qpoints[1:])
             polygons_temp = [polygons_temp[i] for i in indices]
 
             # then we translate the edges in rational coordinate as well
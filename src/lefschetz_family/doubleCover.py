@@ -253,29 +253,15 @@ class DoubleCover(object):
             if self.dim==1:
                 Qt = PolynomialRing(QQ, 't')
                 t = Qt.gens()[0]
-                roots_with_multiplicity = self.P(t+1,1).roots(AlgebraicField())
+                roots_with_multiplicity = Util.roots(self.P(t+1,1))
                 if self.smooth and not self.ctx.debug:
                     for _, m in roots_with_multiplicity:
                         assert m==1, "double critical values, fibration is not Lefschetz"
                 self._critical_values=[e for e, _ in roots_with_multiplicity]
                 return self._critical_values
 
-            R = self.P.parent()
-            _vars = [v for v in R.gens()]
-            forms=[v.dot_product(vector(_vars)) for v in self.fibration[:2]]
-            f=forms[0]/forms[1]
-            S = PolynomialRing(QQ, _vars+['k','t'])
-            k,t= S.gens()[-2:]
-            eqs = [
-                self.P, 
-                forms[1]-1, 
-                t*forms[1]-forms[0]
-            ] + [(f.derivative(var).numerator()*k-self.P.derivative(var)*f.derivative(var).denominator()) for var in _vars]
-
-            ideal = S.ideal(eqs).elimination_ideal(S.gens()[:-1])
-            Qt = PolynomialRing(QQ, 't')
-
-            roots_with_multiplicity = Qt(ideal.groebner_basis()[0]).roots(AlgebraicField())
+            critical_polynomial = Util.critical_polynomial(self.P, self.fibration, self.ctx.elimination)
+            roots_with_multiplicity = Util.roots(critical_polynomial)
             if not self.ctx.debug and not self.ctx.singular:
                 for e in roots_with_multiplicity:
                     assert e[1]==1, "double critical values, fibration is not Lefschetz"
@@ -339,7 +325,7 @@ class DoubleCover(object):
                 x0,x1 = R.gens()
                 alpha = self.P(self.basepoint+1, 1)
                 # beta = denom(self.basepoint+1)**self.degree
-                self._fibre = Hypersurface(x0**2+alpha*x1**2, nbits=self.ctx.nbits)
+                self._fibre = Hypersurface(x0**2+alpha*x1**2, nbits=self.ctx.nbits, target_digits=self.ctx.target_digits)
                 return self._fibre
             evaluate_at_basepoint = RtoS.codomain().hom([self.basepoint], RtoS.codomain().base_ring())
             P = evaluate_at_basepoint(RtoS(self.P))/denom(self.basepoint)**self.degree
@@ -350,7 +336,9 @@ class DoubleCover(object):
                                         nbits=self.ctx.nbits, 
                                         long_fibration=self.ctx.long_fibration, 
                                         depth=self.ctx.depth+1,
-                                        simultaneous_integration=True
+                                        simultaneous_integration=True,
+                                        target_digits=self.ctx.target_digits,
+                                        elimination=self.ctx.elimination
                                         )
 
         return self._fibre
@@ -431,7 +419,7 @@ class DoubleCover(object):
         if not hasattr(self, '_exceptional_divisors'):
             if self.dim==2 and self.degree in [6]: # this is specific for K3 surfaces, while waiting for more robust/efficient methods arrive for the general case
                 if self.degree ==6:
-                    NS = IntegerRelations(self.holomorphic_period_matrix_modification.transpose()).basis
+                    NS = IntegerRelations(self.holomorphic_period_matrix_modification.transpose(), progressive=True).basis
                 section = self.section
                 fibre = self.fibre_class
                 others = (NS * self.intersection_product_modification * matrix([section, fibre]).transpose()).kernel().basis_matrix()
@@ -624,7 +612,7 @@ class DoubleCover(object):
 
         logger.info("[%d] Computing numerical transition matrices for %d integrals (%d edges total)."% (self.dim, rat_coefs[0].nrows(), len(self.fundamental_group.edges)))
         begin = time.time()
-        integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, gaussmanin, nbits=self.ctx.nbits)
+        integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, gaussmanin, nbits=self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         if hasattr(self, '_transition_matrices_holomorphic'):
             Rholo = len(self.holomorphic_forms)
@@ -695,7 +683,7 @@ class DoubleCover(object):
     def integrate(self, L):
         logger.info("[%d] Computing numerical transition matrices of operator of order %d and degree %d (%d edges total)."% (self.dim, L.order(), L.degree(), len(self.fundamental_group.edges)))
         begin = time.time()
-        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits)
+        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         end = time.time()
         duration_str = time.strftime("%H:%M:%S",time.gmtime(end-begin))
@@ -805,11 +793,11 @@ class DoubleCover(object):
             logger.info("[%d] Computing fundamental group with %d critical values."% (self.dim, len(self.critical_values)))
             begin = time.time()
             if self.ctx.method == 'voronoi':# access future delaunay implem here
-                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint)
+                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint, weight=self.ctx.path_weight)
             elif self.ctx.method == 'delaunay_dual':
                 fundamental_group = FundamentalGroupDelaunayDual(self.critical_values, self.basepoint)
             else:
-                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint)
+                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint, weight=self.ctx.path_weight)
             fundamental_group.sort_loops()
 
             end = time.time()
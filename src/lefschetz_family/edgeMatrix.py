@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+class EdgeMatrix(object):
+    """The transition matrix along an edge of a path structure.
+
+    The inverse (transition matrix along the reversed edge) and the complex conjugate (transition matrix along the conjugate edge)
+    are computed only when needed, and at most once.
+    """
+
+    def __init__(self, matrix):
+        self._matrix = matrix
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    @property
+    def inverse(self):
+        if not hasattr(self, "_inverse"):
+            if hasattr(self, "_conjugate") and hasattr(self._conjugate, "_inverse"):
+                self._inverse = self._conjugate._inverse.conjugate()
+            else:
+                self._inverse = self.matrix.inverse()
+        return self._inverse
+
+    @property
+    def conjugate(self):
+        """The EdgeMatrix of the complex conjugate edge."""
+        if not hasattr(self, "_conjugate"):
+            conjugate = EdgeMatrix(self.matrix.conjugate())
+            if hasattr(self, "_inverse"):
+                conjugate._inverse = self._inverse.conjugate()
+            conjugate._conjugate = self
+            self._conjugate = conjugate
+        return self._conjugate
+
+    @property
+    def reverse(self):
+        """The EdgeMatrix of the reversed edge."""
+        if not hasattr(self, "_reverse"):
+            reverse = EdgeMatrix(self.inverse)
+            reverse._inverse = self.matrix
+            reverse._reverse = self
+            self._reverse = reverse
+        return self._reverse
+
+    def __repr__(self):
+        return "transition matrix along edge:\n" + str(self.matrix)
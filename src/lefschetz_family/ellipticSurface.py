@@ -84,7 +84,7 @@ class EllipticSurface(object):
         self._fibration = fibration
         
         if basepoint!= None and not self.ctx.debug: # it is useful to be able to specify the basepoint to avoid being stuck in arithmetic computations if critical values have very large modulus
-            assert basepoint not in self.critical_values, "basepoint is not regular"
+            assert Util.index_of(basepoint, self.critical_values) == None, "basepoint is not regular"
             self._basepoint = basepoint
 
         if not self.ctx.debug:
@@ -160,7 +160,7 @@ class EllipticSurface(object):
     @property
     def critical_values(self):
         if not hasattr(self,'_critical_values'):
-            self._critical_values = self.discriminant.roots(QQbar, multiplicities=False)
+            self._critical_values = Util.roots(self.discriminant, multiplicities=False)
         return self._critical_values
     
     @property
@@ -239,7 +239,7 @@ class EllipticSurface(object):
     @property
     def fibre(self):
         if not hasattr(self,'_fibre'):
-            self._fibre = Hypersurface(self.P(self.basepoint), nbits=self.ctx.nbits, fibration=self._fibration)
+            self._fibre = Hypersurface(self.P(self.basepoint), nbits=self.ctx.nbits, target_digits=self.ctx.target_digits, fibration=self._fibration)
             if self._fibre.intersection_product == matrix([[0,-1], [1,0]]):
                 del self._fibre._monodromy_representation
                 self._fibre.monodromy_representation._extensions_desingularisation = list(reversed(self._fibre.monodromy_representation.extensions_desingularisation))
@@ -340,7 +340,7 @@ class EllipticSurface(object):
         logger.info("Computing numerical transition matrices of operator of order %d and degree %d (%d edges total)."% (L.order(), L.degree(), len(self.fundamental_group.edges)))
         begin = time.time()
 
-        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits)
+        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         
         end = time.time()
@@ -400,7 +400,7 @@ class EllipticSurface(object):
         if not hasattr(self,'_fundamental_group'):
             begin = time.time()
 
-            fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint) # access future delaunay implem here
+            fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint, weight=self.ctx.path_weight) # access future delaunay implem here
             fundamental_group.sort_loops()
 
             end = time.time()
@@ -433,7 +433,7 @@ class EllipticSurface(object):
     @property
     def neron_severi(self):
         if  not hasattr(self, '_neron_severi'):
-            self._neron_severi = IntegerRelations(self.period_matrix.transpose()).basis.rows()
+            self._neron_severi = IntegerRelations(self.period_matrix.transpose(), progressive=True).basis.rows()
         return self._neron_severi
     
     @property
@@ -503,8 +503,8 @@ class EllipticSurface(object):
             rs = []
             roots = L.leading_coefficient().roots(QQbar, multiplicities=False)
             for r in roots:
-                if r in self.critical_values:
-                    i = self.critical_values.index(r)
+                i = Util.index_of(r, self.critical_values)
+                if i != None:
                     ty, _, n = EllipticSingularities.monodromy_class(self.monodromy_matrices[i])
                     bs += [self._b(L, r, ty, n)]
                 else:
@@ -515,8 +515,8 @@ class EllipticSurface(object):
             if L2.leading_coefficient()(0) ==0:
                 r = "infinity"
                 roots += [r]
-                if r in self.critical_values:
-                    i = self.critical_values.index(r)
+                i = Util.index_of(r, self.critical_values)
+                if i != None:
                     ty, _, n = EllipticSingularities.monodromy_class(self.monodromy_matrices[i])
                     bs += [self._b(L2, 0, ty, n)]
                 else:
@@ -627,7 +627,7 @@ class EllipticSurface(object):
     def _compute_transition_matrices_simultaneous(self, rat_coefs):
         gaussmanin = self.family.gaussmanin()
         begin = time.time()
-        integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, gaussmanin, nbits=self.ctx.nbits)
+        integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, gaussmanin, nbits=self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         if hasattr(self, '_transition_matrices_holomorphic'):
             Rholo = len(self.holomorphic_forms)
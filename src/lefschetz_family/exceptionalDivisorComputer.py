@@ -27,7 +27,10 @@ from sage.modules.free_module_element import vector
 from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
 from sage.rings.rational_field import QQ
 from sage.rings.qqbar import QQbar
+from sage.matrix.constructor import matrix
 from sage.matrix.special import zero_matrix
+from sage.rings.finite_rings.finite_field_constructor import FiniteField
+from sage.parallel.decorate import parallel
 
 from .numperiods import interpolation
 
@@ -38,6 +41,7 @@ from .voronoi import FundamentalGroupVoronoi
 from .util import Util
 from .translator import Translator
 from .rootsBraid import RootsBraid
+from .freeGroupAutomorphism import FreeGroupAutomorphism
 
 
 import logging
@@ -54,30 +58,42 @@ class ExceptionalDivisorComputer(object):
         self.Qt = PolynomialRing(QQ, 't')
         self.Qu = PolynomialRing(QQ, ['u', 't'])
 
-    def _compute_coefs(self, b):
-        R = self.variety.family.pol(b).parent()
-        _vars = [v for v in R.gens()]
-        forms=[v.dot_product(vector(_vars)) for v in self.variety.fibre.fibration[:2]]
-        f=forms[0]/forms[1]
-        S = PolynomialRing(QQ, _vars+['k','t'])
-        k,t= S.gens()[-2:]
-        eqs = [
-            self.variety.family.pol(b), 
-            forms[1]-1, 
-            t*forms[1]-forms[0]
-        ] + [(f.derivative(var).numerator()*k-self.variety.family.pol(b).derivative(var)*f.derivative(var).denominator()) for var in _vars]
-
-        ideal = S.ideal(eqs).elimination_ideal(S.gens()[:-1])
-        Qt = PolynomialRing(QQ, 't')
-
-        return Qt(ideal.groebner_basis()[0]).coefficients(sparse=False)
-    
+    def _compute_coefs(self, b, prime=None):
+        """The coefficients of the critical polynomial of the fibre above b, computed over the rationals, or modulo `prime` if it is given."""
+        if prime == None:
+            critical_polynomial = Util.critical_polynomial(self.variety.family.pol(b), self.variety.fibre.fibration, self.variety.ctx.elimination)
+        else:
+            critical_polynomial = Util._critical_polynomial_elimination(self.variety.family.pol(b), self.variety.fibre.fibration, FiniteField(prime)).monic()
+        return critical_polynomial.coefficients(sparse=False)
+
+    @parallel
+    def _compute_coefs_parallel(self, b, prime):
+        return self._compute_coefs(b, prime)
+
+    def _compute_coefs_batch(self, pts, prime=None):
+        """The coefficients of the critical polynomials above the points of `pts`, computed in parallel. Bad evaluations yield None."""
+        res = {}
+        for arg, coefs in self._compute_coefs_parallel([(b, prime) for b in pts]):
+            res[arg[0][0]] = coefs if isinstance(coefs, list) else None
+        return [res.get(b) for b in pts]
+
+    def _critical_values_polynomial_mod(self, prime):
+        Kt = PolynomialRing(FiniteField(prime), 't')
+        fr = interpolation.FunctionReconstruction(Kt, lambda b: self._compute_coefs(b, prime), batch_evaluator=lambda pts: self._compute_coefs_batch(pts, prime))
+        coefs, denom = fr.recons(denomapart=True)
+        return [coefs, denom]
+
     @property
     def critical_values_polynomial(self):
         if not hasattr(self, "_critical_values_polynomial"):
             u, t = self.Qu.gens()
-            fr = interpolation.FunctionReconstruction(self.Qt, self._compute_coefs)
-            coefs, denom = fr.recons(denomapart=True)
+            if self.variety.ctx.elimination == "modular":
+                # the whole bivariate polynomial is reconstructed modulo several primes, then lifted
+                coefs, denom = interpolation.ModularReconstruction(self._critical_values_polynomial_mod).recons()
+                coefs = [self.Qt(c) for c in coefs]
+            else:
+                fr = interpolation.FunctionReconstruction(self.Qt, self._compute_coefs, batch_evaluator=self._compute_coefs_batch)
+                coefs, denom = fr.recons(denomapart=True)
             self._critical_values_polynomial = sum([c(u)*t**i for i,c in zip(range(len(coefs)),coefs)])
         return self._critical_values_polynomial
     
@@ -86,8 +102,15 @@ class ExceptionalDivisorComputer(object):
         """This is the fundamental group of C punctured at the points where the critical polynomial has multiple roots."""
         if not hasattr(self, "_fundamental_group_critical"):
             u, t = self.Qu.gens()
-            double_roots = self.Qt((self.critical_values_polynomial*(t-self.variety.fibre.basepoint)).discriminant(t)(u=t)).roots(QQbar, multiplicities=False)
-            fg= FundamentalGroupVoronoi(double_roots,self.variety.basepoint)
+            double_roots = Util.roots(self.Qt((self.critical_values_polynomial*(t-self.variety.fibre.basepoint)).discriminant(t)(u=t)), multiplicities=False)
+            fg = self.variety.fundamental_group
+            removed = [p for p in fg.points[1:] if Util.index_of(p, double_roots) == None]
+            added = [p for p in double_roots if Util.index_of(p, fg.points[1:]) == None]
+            if isinstance(fg, FundamentalGroupVoronoi) and fg.weight == "length" and len(removed) + len(added) < len(double_roots):
+                # the double roots share most points with the critical values of the variety, so only the cells around the other points are computed again
+                fg, _ = fg.updated(added=added, removed=removed)
+            else:
+                fg = FundamentalGroupVoronoi(double_roots,self.variety.basepoint)
             fg.sort_loops()
             self._fundamental_group_critical = fg
         return self._fundamental_group_critical
@@ -164,7 +187,7 @@ class ExceptionalDivisorComputer(object):
             spec_f = [fibre_translator.specialize_path(path) for path in self.variety.fibre.fundamental_group.pointed_loops]
             fakebp = self.fundamental_group_fibre.points[0]
             
-            s_to_FG = [Util.select_closest_index(self.fundamental_group_fibre.points, s) for s in self.marking_init+[fakebp]]
+            s_to_FG = Util.select_closest_indices(self.fundamental_group_fibre.points, self.marking_init+[fakebp])
             edges = [list(e[:2]) for e in self.roots_braid.minimal_cover_tree(self.marking_init).edges()]
             for i, e in enumerate(edges): # orient the edges away from basepoint
                 if self.roots_braid.minimal_cover_tree(self.marking_init).distance(e[1], self.roots_braid.npoints) < self.roots_braid.minimal_cover_tree(self.marking_init).distance(e[0],self.roots_braid.npoints):
@@ -198,10 +221,26 @@ class ExceptionalDivisorComputer(object):
             spec_f = [res] + spec_f
             self._spec_f  = spec_f # it's nice to have this for plotting purposes
 
-            self._words_fibre = [Translator.word(path, self.fundamental_group_fibre.duality, mtc_init, self.roots_braid.freeGroup) for path in spec_f]
+            self._words_fibre = Translator.words(spec_f, self.fundamental_group_fibre.duality, mtc_init, self.roots_braid.freeGroup)
 
         return self._words_fibre 
     
+    def _transport(self, word, V, monodromy, columns, powers):
+        """Applies the letters of `word`, from the last one, to the columns of V, which are the cycles of the thimbles of indices `columns`.
+        The coefficients of the successive differences along the vanishing cycles are added to the corresponding columns of `monodromy`. Returns the transported V."""
+        vanishing_cycles = self.variety.fibre.vanishing_cycles
+        for k, l in enumerate(reversed(word)):
+            assert k==0 or l!=word[-k], "letter with exponent other than 1 or -1"
+            if abs(l)==1:
+                continue
+            i = abs(l)-2
+            Mp, Mp1 = powers[l]
+            pivot = vanishing_cycles[i].nonzero_positions()[0]
+            for j, c in zip(columns, (Mp1*V).row(pivot)):
+                monodromy[i, j] += c / vanishing_cycles[i][pivot]
+            V = Mp*V
+        return V
+
     @property
     def thimble_monodromy(self):
         if not hasattr(self, "_thimble_monodromy"):
@@ -210,6 +249,12 @@ class ExceptionalDivisorComputer(object):
             ttox = thimblegroup.hom(self.words_fibre)
             xtot = Util.invert_morphism(ttox)
             
+            # words are handled as FreeGroupAutomorphism images, in Tietze notation
+            ttox_native, xtot_native = FreeGroupAutomorphism.from_hom(ttox), FreeGroupAutomorphism.from_hom(xtot)
+            powers = {} # the matrices M_i**p and M_i**p-1, computed once for each letter
+            for i, M in enumerate(self.variety.fibre.monodromy_matrices):
+                powers[i+2], powers[-i-2] = (M, M-1), (M**-1, M**-1-1)
+
             isos = []
             thimble_monodromy = []
             adapted_paths_z = [[self.fundamental_group_critical.vertices[v] for v in path] for path in self.adapted_paths]
@@ -218,30 +263,26 @@ class ExceptionalDivisorComputer(object):
             logger.info("Computing the braid action.")
             self.roots_braid.compute_all_isomorphisms()
             logger.info("There are %d edges in total."% len(self.roots_braid.edges))
+            fibre_thimbles = self.variety.fibre.thimbles
             for index_thimble, thimble_path in enumerate(adapted_paths_z):
                 logger.info("Computing monodromy of path between blowups along loop %d/%d: %d edges "% (index_thimble+1,len(adapted_paths_z), len(thimble_path)))
-                iso = self.roots_braid.isomorphism_along_path(thimble_path)
-                isos += [iso]
+                path = tuple(Util.select_closest_indices(self.roots_braid.vertices, thimble_path))
+                iso_native = self.roots_braid.native_isomorphism_along_path(path)
+                isos += [iso_native.to_hom(self.roots_braid.freeGroup)]
                 monodromy = zero_matrix(len(ts)-1)
                 
-                conjtobp = Util.middle(xtot(iso(ttox(ts[0]))))
+                conjtobp = Util.middle(thimblegroup(list(xtot_native(iso_native(ttox_native.image(1)))))).Tietze()
                 
-                for tinit, chain in zip(ts[1:], self.variety.fibre.thimbles):
-                    v = chain[0]
-                    ttilde = xtot(iso(ttox(tinit)))
-                    ttilde = conjtobp**-1*ttilde*conjtobp
-                    
-                    j = ts.index(tinit)-1
-                    for t, p in list(reversed(ttilde.syllables())):
-                        assert p in [-1,1]
-                        i = ts.index(t)
-                        if i==0:
-                            continue
-                        i-=1
-                        monodromy[i, j]+=(self.variety.fibre.monodromy_matrices[i]**p-1)*v / self.variety.fibre.vanishing_cycles[i]
-                        v = self.variety.fibre.monodromy_matrices[i]**p*v
+                # the word of each thimble is conjtobp^-1 * w * conjtobp, so both conjugations are applied to the cycles of all the thimbles at once
+                columns = list(range(len(fibre_thimbles)))
+                V = self._transport(conjtobp, matrix([chain[0] for chain in fibre_thimbles]).transpose(), monodromy, columns, powers)
+                for j in columns:
+                    w = xtot_native(iso_native(ttox_native.image(j+2)))
+                    V.set_column(j, self._transport(w, V.matrix_from_columns([j]), monodromy, [j], powers).column(0))
+                V = self._transport(FreeGroupAutomorphism.invert(conjtobp), V, monodromy, columns, powers)
                 thimble_monodromy += [monodromy]
-                assert v-chain[0] == self.variety.fibre.vanishing_cycles[j], "boundaries not matching"
+                j = len(fibre_thimbles)-1
+                assert V.column(j)-fibre_thimbles[j][0] == self.variety.fibre.vanishing_cycles[j], "boundaries not matching"
             self._thimble_monodromy = thimble_monodromy
             self._isos = isos
             end = time.time()
@@ -18,4 +18,10 @@ class FailFast(Exception):
     pass
 
 class NotSmoothError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class IntegrationError(Exception):
+    pass
+
+class TrackingError(Exception):
+    pass
@@ -71,7 +71,7 @@ class Fibration(object):
 
         if critical_values==None:
             _, denom = self._family.gaussmanin()
-            self._critical_values = denom.roots(QQbar, multiplicities=False)
+            self._critical_values = Util.roots(denom, multiplicities=False)
         else:
             self._critical_values = critical_values
 
@@ -91,7 +91,7 @@ class Fibration(object):
             self._fibre = fibre
 
         if basepoint != None: # it is useful to be able to specify the basepoint to avoid being stuck in arithmetic computations if critical values have very large modulus
-            assert basepoint not in self.critical_values, "basepoint is not regular"
+            assert Util.index_of(basepoint, self.critical_values) == None, "basepoint is not regular"
             self._basepoint = basepoint
         
         if not self.ctx.debug:
@@ -120,7 +120,7 @@ class Fibration(object):
     def critical_values(self):
         if not hasattr(self,'_critical_values'):
             _, denom = self.family.gaussmanin
-            self._critical_values = denom.roots(QQbar, multiplicities=False)
+            self._critical_values = Util.roots(denom, multiplicities=False)
         return self._critical_values
 
     def vector_to_form(self, v):
@@ -203,7 +203,7 @@ class Fibration(object):
     @property
     def fibre(self):
         if not hasattr(self,'_fibre'):
-            self._fibre = Hypersurface(self.P(self.basepoint), nbits=self.ctx.nbits, fibration=self._fibration)
+            self._fibre = Hypersurface(self.P(self.basepoint), nbits=self.ctx.nbits, target_digits=self.ctx.target_digits, fibration=self._fibration)
         return self._fibre
     
     @property
@@ -236,7 +236,7 @@ class Fibration(object):
         logger.info("Computing numerical transition matrices of operator of order %d and degree %d (%d edges total)."% (L.order(), L.degree(), len(self.fundamental_group.edges)))
         begin = time.time()
 
-        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits)
+        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         
         end = time.time()
@@ -273,7 +273,7 @@ class Fibration(object):
         if not hasattr(self,'_fundamental_group'):
             begin = time.time()
 
-            fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint) # access future delaunay implem here
+            fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint, weight=self.ctx.path_weight) # access future delaunay implem here
             fundamental_group.sort_loops()
 
             end = time.time()
@@ -141,7 +141,14 @@ class FibreProduct(object):
     @property
     def fundamental_group(self):
         if not hasattr(self,'_fundamental_group'):
-            fundamental_group = FundamentalGroupVoronoi([e for e in self.critical_values if e!= 'infinity'], self.basepoint)
+            critical_values = [e for e in self.critical_values if e!= 'infinity']
+            S1_group = self.S1.fundamental_group
+            if isinstance(S1_group, FundamentalGroupVoronoi) and S1_group.weight == self.ctx.path_weight:
+                # the critical values of S1 are critical values of self, so only the cells around the critical values of S2 are computed again
+                added = [e for e in critical_values if Util.index_of(e, S1_group.points[1:]) == None]
+                fundamental_group, _ = S1_group.updated(added=added)
+            else:
+                fundamental_group = FundamentalGroupVoronoi(critical_values, self.basepoint, weight=self.ctx.path_weight)
             fundamental_group.sort_loops()
             self._critical_values = fundamental_group.points[1:]
             self._fundamental_group = fundamental_group
@@ -197,7 +204,7 @@ class FibreProduct(object):
         logger.info("Computing numerical transition matrices of operator of order %d and degree %d (%d edges total)."% (L.order(), L.degree(), len(self.fundamental_group.edges)))
         begin = time.time()
 
-        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits)
+        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         
         end = time.time()
@@ -272,8 +279,9 @@ class FibreProduct(object):
             monodromy_matrices = self.monodromy_matrices
             expected_types = []
             for c in self.critical_values:
-                if c in self.S1.critical_values:
-                    expected_types += [self.S1.types[self.S1.critical_values.index(c)]]
+                i = Util.index_of(c, self.S1.critical_values)
+                if i != None:
+                    expected_types += [self.S1.types[i]]
                 else:
                     expected_types += ["I0"]
             fibre_intersection_product = tens1(self.S1.fibre.intersection_product)*tens2(self.S2.fibre.intersection_product)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from scipy.spatial import Delaunay, QhullError
+
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FloatVoronoiDiagram(object):
+    def __init__(self, points, ambiguity=100):
+        """FloatVoronoiDiagram(points)
+
+        The Voronoi diagram of a list of points of the plane, computed in double precision as the dual of their Delaunay triangulation (computed by Qhull).
+        Vertices of the diagram that are closer than a given tolerance are merged,
+        and the computation is deemed unreliable if two vertices are neither merged nor `ambiguity` times further apart than the tolerance.
+        """
+        self._points = [(float(x), float(y)) for x, y in points]
+        self._ambiguity = ambiguity
+
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def triangles(self):
+        """The triangles of the Delaunay triangulation, as triples of indices of self.points. This is empty if the points are degenerate (e.g. all collinear)."""
+        if not hasattr(self, "_triangles"):
+            try:
+                simplices = Delaunay(np.array(self.points)).simplices
+                self._triangles = [[int(i) for i in triangle] for triangle in simplices]
+            except (QhullError, ValueError):
+                logger.info("Could not triangulate %d points in double precision"% len(self.points))
+                self._triangles = []
+        return self._triangles
+
+    @property
+    def circumcenters(self):
+        if not hasattr(self, "_circumcenters"):
+            if len(self.triangles) == 0:
+                self._circumcenters = []
+                return self._circumcenters
+            points = np.array(self.points)
+            triangles = np.array(self.triangles)
+            a, b, c = points[triangles[:,0]], points[triangles[:,1]], points[triangles[:,2]]
+            b, c = b-a, c-a
+            with np.errstate(divide="ignore", invalid="ignore"):
+                d = 2*(b[:,0]*c[:,1] - b[:,1]*c[:,0])
+                b2, c2 = (b*b).sum(axis=1), (c*c).sum(axis=1)
+                x = a[:,0] + (c[:,1]*b2 - b[:,1]*c2)/d
+                y = a[:,1] + (b[:,0]*c2 - c[:,0]*b2)/d
+            self._circumcenters = list(zip(x.tolist(), y.tolist()))
+        return self._circumcenters
+
+    @property
+    def dual_edges(self):
+        """A dictionary mapping each edge of the Delaunay triangulation, as a sorted pair of indices of self.points, to the indices of the triangles containing it."""
+        if not hasattr(self, "_dual_edges"):
+            dual_edges = {}
+            for k, triangle in enumerate(self.triangles):
+                for i, j in [[0,1],[1,2],[2,0]]:
+                    e = tuple(sorted([triangle[i], triangle[j]]))
+                    dual_edges[e] = dual_edges.get(e, []) + [k]
+            self._dual_edges = dual_edges
+        return self._dual_edges
+
+    @staticmethod
+    def _is_cycle(edges):
+        """Whether `edges`, given as pairs of indices, form a single cycle."""
+        if len(edges) < 3 or len(set([tuple(e) for e in edges])) != len(edges):
+            return False
+        adjacency = {}
+        for a, b in edges:
+            adjacency[a] = adjacency.get(a, []) + [b]
+            adjacency[b] = adjacency.get(b, []) + [a]
+        if any([len(neighbours) != 2 for neighbours in adjacency.values()]):
+            return False
+        start = edges[0][0]
+        previous, current, length = start, adjacency[start][0], 1
+        while current != start:
+            a, b = adjacency[current]
+            previous, current = current, b if a == previous else a
+            length += 1
+        return length == len(edges)
+
+    def regions(self, tol):
+        """Returns the vertices of the diagram and, for each point, the bounded edges and the vertices of its cell, given as indices of these vertices.
+        Vertices closer than `tol` are merged. Returns None if the computation cannot be trusted with this tolerance,
+        in particular if the cell of a point that is not on the boundary of the triangulation is not a single closed polygon.
+        """
+        if len(self.triangles) == 0:
+            return None
+        scale = max([max(abs(x), abs(y)) for x, y in self.points])
+        if tol < 2**-40 * scale:
+            logger.info("Tolerance is too small for a Voronoi diagram in double precision")
+            return None
+
+        # circumcenters are clustered with a grid of mesh ambiguity*tol, so that all the close enough vertices lie in neighbouring cells
+        mesh = self._ambiguity*tol
+        grid = {}
+        vertices = []
+        cluster = []
+        for x, y in self.circumcenters:
+            if not (math.isfinite(x) and math.isfinite(y)):
+                logger.info("Degenerate triangle in Delaunay triangulation")
+                return None
+            cell = (math.floor(x/mesh), math.floor(y/mesh))
+            found = None
+            for dx in [-1,0,1]:
+                for dy in [-1,0,1]:
+                    for r in grid.get((cell[0]+dx, cell[1]+dy), []):
+                        d = math.hypot(x - vertices[r][0], y - vertices[r][1])
+                        if d <= tol:
+                            found = r
+                        elif d <= mesh:
+                            logger.info("Ambiguous vertices in Voronoi diagram")
+                            return None
+            if found == None:
+                found = len(vertices)
+                vertices += [(x, y)]
+                grid[cell] = grid.get(cell, []) + [found]
+            cluster += [found]
+
+        cell_vertices = [set() for p in self.points]
+        for k, triangle in enumerate(self.triangles):
+            for i in triangle:
+                cell_vertices[i].add(cluster[k])
+
+        cells = [[] for p in self.points]
+        boundary = set()
+        for e, triangles in self.dual_edges.items():
+            if len(triangles) != 2:
+                # the cells of the endpoints of an edge of the convex hull are unbounded
+                boundary.update(e)
+                continue
+            c1, c2 = cluster[triangles[0]], cluster[triangles[1]]
+            if c1 != c2:
+                for i in e:
+                    cells[i] += [[min(c1, c2), max(c1, c2)]]
+
+        for i in range(len(self.points)):
+            if i not in boundary and not FloatVoronoiDiagram._is_cycle(cells[i]):
+                logger.info("Cell of point %d of Voronoi diagram is not a closed polygon"% i)
+                return None
+        return vertices, cells, [sorted(vs) for vs in cell_vertices]
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+class FreeGroupAutomorphism(object):
+    def __init__(self, images):
+        """An endomorphism of the free group on n generators, given by the images of the generators.
+
+        Words are tuples of nonzero integers in Tietze notation (i stands for the i-th generator and -i for its inverse), and are kept freely reduced.
+        """
+        self._images = tuple(FreeGroupAutomorphism.reduce(w) for w in images)
+
+    @staticmethod
+    def from_hom(phi):
+        """The FreeGroupAutomorphism with the same images as the morphism of free groups phi."""
+        return FreeGroupAutomorphism([phi(x).Tietze() for x in phi.domain().gens()])
+
+    def to_hom(self, domain, codomain=None):
+        """The morphism from `domain` to `codomain` (by default, `domain`) with the same images."""
+        if codomain == None:
+            codomain = domain
+        return domain.hom([codomain(list(w)) for w in self.images])
+
+    @property
+    def images(self):
+        return self._images
+
+    @staticmethod
+    def reduce(w):
+        res = []
+        for l in w:
+            if len(res)>0 and res[-1] == -l:
+                res.pop()
+            else:
+                res.append(l)
+        return tuple(res)
+
+    @staticmethod
+    def invert(w):
+        return tuple(-l for l in reversed(w))
+
+    @staticmethod
+    def concatenate(w1, w2):
+        """The reduced product of two reduced words, cancelling letters at the junction only."""
+        k = 0
+        while k < min(len(w1), len(w2)) and w1[len(w1)-1-k] == -w2[k]:
+            k += 1
+        return w1[:len(w1)-k] + w2[k:]
+
+    def image(self, l):
+        """The image of the letter l (a nonzero integer)."""
+        if l > 0:
+            return self._images[l-1]
+        if not hasattr(self, "_inverse_images"):
+            self._inverse_images = [FreeGroupAutomorphism.invert(w) for w in self._images]
+        return self._inverse_images[-l-1]
+
+    def __call__(self, w):
+        res = ()
+        for l in w:
+            res = FreeGroupAutomorphism.concatenate(res, self.image(l))
+        return res
+
+    def __mul__(self, other):
+        """The composition self o other."""
+        return FreeGroupAutomorphism([self(w) for w in other.images])
+
+    def __eq__(self, other):
+        return isinstance(other, FreeGroupAutomorphism) and self.images == other.images
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.images)
+
+    def __len__(self):
+        return len(self._images)
+
+    def inverse(self):
+        """The inverse automorphism, computed by Nielsen reduction of the images, or None if the reduction does not end with single letters."""
+        if not hasattr(self, "_inverse"):
+            n = len(self)
+            vs = list(self.images)
+            us = [(i+1,) for i in range(n)] # us[i] is the word in the generators whose image is vs[i]
+            improved = True
+            while improved:
+                improved = False
+                for i in range(n):
+                    for j in range(n):
+                        if i==j:
+                            continue
+                        for e in [1,-1]:
+                            vj = vs[j] if e==1 else FreeGroupAutomorphism.invert(vs[j])
+                            uj = us[j] if e==1 else FreeGroupAutomorphism.invert(us[j])
+                            right = FreeGroupAutomorphism.concatenate(vs[i], vj)
+                            left = FreeGroupAutomorphism.concatenate(vj, vs[i])
+                            if len(right) < len(vs[i]):
+                                vs[i], us[i] = right, FreeGroupAutomorphism.concatenate(us[i], uj)
+                                improved = True
+                            elif len(left) < len(vs[i]):
+                                vs[i], us[i] = left, FreeGroupAutomorphism.concatenate(uj, us[i])
+                                improved = True
+
+            images = [None]*n
+            for v, u in zip(vs, us):
+                if len(v) != 1 or abs(v[0]) > n:
+                    images = None
+                    break
+                images[abs(v[0])-1] = u if v[0]>0 else FreeGroupAutomorphism.invert(u)
+            self._inverse = None if images == None or None in images else FreeGroupAutomorphism(images)
+        return self._inverse
+
+    def __repr__(self):
+        return "free group automorphism with images " + str(list(self.images))
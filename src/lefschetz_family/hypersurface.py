@@ -86,7 +86,7 @@ class Hypersurface(object):
             fg = self.fundamental_group # this allows reordering the critical points straight away and prevents shenanigans. There should be a better way to do this
 
         if basepoint!= None: # it is useful to be able to specify the basepoint to avoid being stuck in arithmetic computations if critical values have very large modulus
-            assert basepoint not in self.critical_values, "basepoint is not regular"
+            assert Util.index_of(basepoint, self.critical_values) == None, "basepoint is not regular"
             self._basepoint = basepoint
 
         # self.check_smoothness()
@@ -267,22 +267,8 @@ class Hypersurface(object):
     @property
     def critical_values(self):
         if not hasattr(self,'_critical_values'):
-            R = self.P.parent()
-            _vars = [v for v in R.gens()]
-            forms=[v.dot_product(vector(_vars)) for v in self.fibration[:2]]
-            f=forms[0]/forms[1]
-            S = PolynomialRing(QQ, _vars+['k','t'])
-            k,t= S.gens()[-2:]
-            eqs = [
-                self.P, 
-                forms[1]-1, 
-                t*forms[1]-forms[0]
-            ] + [(f.derivative(var).numerator()*k-self.P.derivative(var)*f.derivative(var).denominator()) for var in _vars]
-
-            ideal = S.ideal(eqs).elimination_ideal(S.gens()[:-1])
-            Qt = PolynomialRing(self.P.base_ring(), 't')
-
-            roots_with_multiplicity = Qt(ideal.groebner_basis()[0]).roots(AlgebraicField())
+            critical_polynomial = Util.critical_polynomial(self.P, self.fibration, self.ctx.elimination)
+            roots_with_multiplicity = Util.roots(critical_polynomial)
             if not self.ctx.debug and not self.ctx.singular:
                 for e in roots_with_multiplicity:
                     assert e[1]==1, "Double critical values, fibration is not Lefschetz. Try changing `fibration` (or running again if `fibration` was not set)."
@@ -293,26 +279,19 @@ class Hypersurface(object):
     def monodromy_matrices(self):
         assert self.dim!=0, "Cannot compute monodromy matrices in dimension 0"
         if not hasattr(self, '_monodromy_matrices'):
-            i=0
-            transition_matrices = self.transition_matrices_monodromy
-
-            n = len(self.fibre.homology) 
-            
-            cohomology_fibre_to_family = self.family._coordinates([self.family.pol.parent()(w) for w in self.fibre.cohomology_internal], self.basepoint)
-            initial_conditions = cohomology_fibre_to_family.inverse()
-
-            cohomology_monodromies = [initial_conditions.inverse() * M * initial_conditions for M in transition_matrices]
-            if self.dim%2==1:
-                cohomology_monodromies = [block_diagonal_matrix([M, identity_matrix(1)]) for M in cohomology_monodromies]
-
-            Ms = [(self.fibre.period_matrix.inverse() * M * self.fibre.period_matrix) for M in cohomology_monodromies]
-            try:
-                Ms = [M.change_ring(ZZ) for M in Ms]
-            except:
-                if self.ctx.debug:
-                    logger.info("Monodromy is not integral")
-                else:
-                    raise Exception("Monodromy is not integral")
+            Ms = None
+            known = any([hasattr(self, attribute) for attribute in ['_transition_matrices_monodromy', '_transition_matrices', '_transition_matrices_holomorphic']])
+            if self.ctx.monodromy_only and not known:
+                Ms = self._monodromy_matrices_low_precision()
+            if Ms == None:
+                Ms = self._monodromy_in_homology(self.transition_matrices_monodromy)
+                try:
+                    Ms = [M.change_ring(ZZ) for M in Ms]
+                except:
+                    if self.ctx.debug:
+                        logger.info("Monodromy is not integral")
+                    else:
+                        raise Exception("Monodromy is not integral")
                 
             if not self.ctx.singular and not self.ctx.debug:
                 for M in Ms:
@@ -320,6 +299,52 @@ class Hypersurface(object):
             
             self._monodromy_matrices = Ms
         return self._monodromy_matrices
+
+    def _monodromy_in_homology(self, transition_matrices):
+        """Expresses the transition matrices of the Gauss-Manin connection in the homology of the fibre."""
+        cohomology_fibre_to_family = self.family._coordinates([self.family.pol.parent()(w) for w in self.fibre.cohomology_internal], self.basepoint)
+        initial_conditions = cohomology_fibre_to_family.inverse()
+
+        cohomology_monodromies = [initial_conditions.inverse() * M * initial_conditions for M in transition_matrices]
+        if self.dim%2==1:
+            cohomology_monodromies = [block_diagonal_matrix([M, identity_matrix(1)]) for M in cohomology_monodromies]
+
+        return [(self.fibre.period_matrix.inverse() * M * self.fibre.period_matrix) for M in cohomology_monodromies]
+
+    def _monodromy_matrices_low_precision(self, nbits=64):
+        """Computes the monodromy matrices from transition matrices integrated with the lowest precision that allows to certify their rounding to integers.
+        The operator and the fragmentation of the edges are computed once, and only the integration of the fragments is redone at each precision.
+        Returns None if rounding is still ambiguous with the working precision of the context."""
+        rat_coefs = self.family.coordinates([self._restrict_form(self.cohomology_internal[0])])
+        if self.ctx.simultaneous_integration:
+            integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, self.family.gaussmanin(), nbits=nbits)
+            gaussmanin_part = lambda M: M.submatrix(1,1)
+        else:
+            R, denom = rat_coefs
+            L = self.picard_fuchs_equation(R.row(0)/denom)
+            L = L * L.parent().gens()[0]
+            integrator = Integrator(self.fundamental_group, L, nbits)
+            integration_correction = diagonal_matrix([1/ZZ(factorial(k)) for k in range(L.order())])
+            initial_conditions = (integration_correction * self.derivatives_values_at_basepoint(0)).submatrix(1,0)
+            initial_conditions_inverse = initial_conditions.inverse()
+            gaussmanin_part = lambda M: initial_conditions_inverse * M.submatrix(1,1) * initial_conditions
+
+        while True:
+            nbits = min(nbits, self.ctx.nbits)
+            logger.info("[%d] Computing transition matrices for monodromy with %d bits of precision."% (self.dim, nbits))
+            integrator.change_precision(nbits)
+            transition_matrices = [gaussmanin_part(M) for M in integrator.transition_matrices]
+            Ms = [Util.round_certified(M) for M in self._monodromy_in_homology(transition_matrices)]
+            if None not in Ms:
+                self._transition_matrices_monodromy = transition_matrices
+                return Ms
+            if nbits >= self.ctx.nbits:
+                logger.info("[%d] Rounding of monodromy matrices is ambiguous with %d bits of precision."% (self.dim, nbits))
+                if self.ctx.target_digits == None:
+                    # these are the transition matrices the default computation would produce
+                    self._transition_matrices_monodromy = transition_matrices
+                return None
+            nbits = 2*nbits
     
     @property
     def fibre(self):
@@ -335,7 +360,9 @@ class Hypersurface(object):
                                        nbits=self.ctx.nbits, 
                                        long_fibration=self.ctx.long_fibration, 
                                        depth=self.ctx.depth+1,
-                                       simultaneous_integration = self.ctx.simultaneous_integration
+                                       simultaneous_integration = self.ctx.simultaneous_integration,
+                                       target_digits = self.ctx.target_digits,
+                                       elimination = self.ctx.elimination
                                        )
 
         return self._fibre
@@ -422,9 +449,9 @@ class Hypersurface(object):
         if not hasattr(self, '_exceptional_divisors'):
             if self.dim==2 and self.degree in [3,4]: # this is specific for K3 surfaces, while waiting for more robust/efficient methods arrive for the general case
                 if self.degree ==4:
-                    NS = IntegerRelations(self.holomorphic_period_matrix_modification.transpose()).basis
+                    NS = IntegerRelations(self.holomorphic_period_matrix_modification.transpose(), progressive=True).basis
                 if self.degree==3:
-                    NS = IntegerRelations(self.period_matrix_modification.transpose()).basis
+                    NS = IntegerRelations(self.period_matrix_modification.transpose(), progressive=True).basis
                 section = self.section
                 fibre = self.fibre_class
                 others = (NS * self.intersection_product_modification * matrix([section, fibre]).transpose()).kernel().basis_matrix()
@@ -600,7 +627,7 @@ class Hypersurface(object):
 
         logger.info("[%d] Computing numerical transition matrices for %d integrals (%d edges total)."% (self.dim, rat_coefs[0].nrows(), len(self.fundamental_group.edges)))
         begin = time.time()
-        integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, gaussmanin, nbits=self.ctx.nbits)
+        integrator = IntegratorSimultaneous(self.fundamental_group, rat_coefs, gaussmanin, nbits=self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         if hasattr(self, '_transition_matrices_holomorphic'):
             Rholo = len(self.holomorphic_forms)
@@ -656,7 +683,7 @@ class Hypersurface(object):
     def integrate(self, L):
         logger.info("[%d] Computing numerical transition matrices of operator of order %d and degree %d (%d edges total)."% (self.dim, L.order(), L.degree(), len(self.fundamental_group.edges)))
         begin = time.time()
-        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits)
+        integrator = Integrator(self.fundamental_group, L, self.ctx.nbits, target_digits=self.ctx.target_digits)
         transition_matrices = integrator.transition_matrices
         end = time.time()
         duration_str = time.strftime("%H:%M:%S",time.gmtime(end-begin))
@@ -785,11 +812,11 @@ class Hypersurface(object):
             logger.info("[%d] Computing fundamental group with %d critical values."% (self.dim, len(self.critical_values)))
             begin = time.time()
             if self.ctx.method == 'voronoi':# access future delaunay implem here
-                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint)
+                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint, weight=self.ctx.path_weight)
             elif self.ctx.method == 'delaunay_dual':
                 fundamental_group = FundamentalGroupDelaunayDual(self.critical_values, self.basepoint)
             else:
-                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint)
+                fundamental_group = FundamentalGroupVoronoi(self.critical_values, self.basepoint, weight=self.ctx.path_weight)
             fundamental_group.sort_loops()
 
             end = time.time()
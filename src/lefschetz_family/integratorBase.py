@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+try:
+    import sage.all
+except ImportError:
+    import sage.all__sagemath_modules
+
+from sage.misc.flatten import flatten
+from sage.functions.other import ceil
+from sage.misc.functional import log
+from sage.rings.complex_mpfr import ComplexField
+
+from .util import Util
+from .exceptions import IntegrationError
+from .edgeMatrix import EdgeMatrix
+
+from abc import ABC, abstractmethod
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class IntegratorBase(ABC):
+    """The integration of a differential system along the edges of a path structure, shared by Integrator and IntegratorSimultaneous.
+
+    Subclasses provide the parallel methods `fragment_path` and `_integrate_edge`,
+    and the arguments these are called with through `_fragmentation_input` and `_integration_input`.
+    """
+
+    @abstractmethod
+    def _fragmentation_input(self, e):
+        """The arguments of `fragment_path` for the edge `e`, after the indices."""
+
+    @abstractmethod
+    def _integration_input(self, fragment, nbits):
+        """The arguments of `_integrate_edge` for `fragment` with working precision `nbits`, after the indices."""
+
+    @property
+    def target_bits(self):
+        """The number of bits of precision the transition matrices of the fragments should be recovered with in autotuning mode."""
+        return ceil(self.target_digits*log(10, 2))
+    
+
+    @property
+    def transition_matrices(self):
+        if not hasattr(self, "_transition_matrices"):
+            transition_matrices = []
+            for path in self.voronoi.pointed_loops:
+                transition_matrix = 1
+                N = len(path)
+                for i in range(N-1):
+                    e = path[i:i+2]
+                    if e in self.voronoi.edges:
+                        index = self.voronoi.edges.index(e)
+                        transition_matrix = self.integrated_edges[index].matrix * transition_matrix
+                    else:
+                        index = self.voronoi.edges.index([e[1], e[0]])
+                        transition_matrix = self.integrated_edges[index].inverse * transition_matrix
+                transition_matrices += [transition_matrix]
+            self._transition_matrices = transition_matrices
+        return self._transition_matrices
+
+    def find_complex_conjugates(self):
+        complex_conjugates = [None]*len(self.voronoi.vertices)
+        for i in range(len(self.voronoi.vertices)):
+            if complex_conjugates[i]==None:
+                if self.voronoi.vertices[i].conjugate() in self.voronoi.vertices:
+                    complex_conjugates[i] = self.voronoi.vertices.index(self.voronoi.vertices[i].conjugate())
+                    complex_conjugates[complex_conjugates[i]] = i
+        return complex_conjugates
+    
+    def change_precision(self, nbits):
+        """Sets the working precision to `nbits` and forgets the transition matrices computed so far.
+        The fragmentation of the edges is kept, so that integrating again at another precision only redoes the integration of the fragments."""
+        self.nbits = nbits
+        for attribute in ["_integrated_edges", "_transition_matrices", "_cost_report"]:
+            if hasattr(self, attribute):
+                delattr(self, attribute)
+
+    def fragment_edges(self, edges):
+        """Splits each edge of `edges` into fragments along which the transition matrix is computed in a single run of analytic continuation.
+        The result is kept, and reused when the same edges are integrated again."""
+        if hasattr(self, "_fragmented_edges") and self._fragmented_input == edges:
+            return self._fragmented_edges
+        N = len(edges)
+        logger.info("Fragmenting %d edges to integrate"% (N))
+        begin = time.time()
+        _fragmented_edges = self.fragment_path([([i,N],) + self._fragmentation_input(e) for i, e in list(enumerate(edges))])
+        fragmented_edges = [None]*len(edges)
+        for [inp, _], fragments in _fragmented_edges:
+            if fragments == 'NO DATA':
+                raise Exception("Failed fragmentation of edge [%d/%d]."%(inp[0][0], inp[0][1]))
+            fragmented_edges[inp[0][0]] = fragments
+        end = time.time()
+        duration = end-begin
+        duration_str = time.strftime("%H:%M:%S",time.gmtime(duration))
+        if end-begin >= 24*60*60:
+            ndays = (end-begin)//24*60*60
+            duration_str = str(ndays)+"d "+duration_str
+        self._fragmented_input = edges
+        self._fragmented_edges = fragmented_edges
+        logger.info("Fragmented edges in %s"% (duration_str))
+        return fragmented_edges
+
+    def integrate_edges(self, edges, loops=None):
+        """Integrates along each edge of `edges` and returns the list of transition matrices.
+        In autotuning mode, `loops` gives the loops along which the transition matrices are multiplied, as lists of indices of `edges`."""
+        fragmented_edges = self.fragment_edges(edges)
+        
+        fragmented_edges_flat = flatten(fragmented_edges, max_level=1)
+        N = len(fragmented_edges_flat)
+        if self.target_digits is None:
+            nbits = [self.nbits]*N
+        else:
+            if loops is None:
+                loops = [[k] for k in range(len(edges))]
+            nbits, required = self._estimate_nbits(fragmented_edges, loops)
+
+        begin = time.time()
+        integration_result_sorted = self._integrate_fragments(fragmented_edges_flat, nbits)
+        if self.target_digits is not None:
+            integration_result_sorted = self._refine_fragments(fragmented_edges_flat, integration_result_sorted, nbits, required)
+        end = time.time()
+        duration = end-begin
+        duration_str = time.strftime("%H:%M:%S",time.gmtime(duration))
+        if end-begin >= 24*60*60:
+            ndays = (end-begin)//24*60*60
+            duration_str = str(ndays)+"d "+duration_str
+
+        logger.info("Integrated fragments in %s"% (duration_str))
+
+        integrated_edges = []
+        j=0
+        for fragmented_edge in fragmented_edges:
+            integrated_edges += [1]
+            for i in range(len(fragmented_edge)):
+                integrated_edges[-1] = integration_result_sorted[j] * integrated_edges[-1]
+                j+=1
+        return integrated_edges
+
+    def _integrate_fragments(self, fragments, nbits, strict=True):
+        """Integrates each fragment `fragments[i]` with working precision `nbits[i]`, and returns the list of transition matrices.
+        If `strict` is False, the fragments that could not be integrated yield None instead of raising an error."""
+        N = len(fragments)
+        integration_result = self._integrate_edge([([i,N],) + self._integration_input(e, nbits[i]) for i, e in list(enumerate(fragments))])
+
+        integration_result_sorted = [None] * N
+        for [inp, _], ntm in integration_result:
+            if ntm == 'NO DATA':
+                if not strict:
+                    continue
+                raise IntegrationError("Failed to integrate fragment [%d/%d] of operator. Try increasing ``nbits``."%(inp[0][0], inp[0][1]))
+            integration_result_sorted[inp[0][0]] = ntm
+        return integration_result_sorted
+
+    def _guard_bits(self, N):
+        """The margin (in bits) kept on each fragment to absorb the precision lost when multiplying the transition matrices of N fragments."""
+        return ceil(log(N, 2)) + 8
+
+    def _estimate_nbits(self, fragmented_edges, loops, initial_probe_nbits=64, probes_per_edge=3):
+        """Chooses the working precision of each fragment, and the precision its transition matrix must be recovered with.
+
+        A few representative fragments of each edge are first integrated at low precision: the shortest ones, which lie closest to the singularities, and the longest one.
+        The precision lost on a fragment in this probe is its condition estimate, and the other fragments of the edge are assigned the worst estimate of the probed ones.
+        The error on a fragment is then amplified by the norms of the other factors in the products along `loops`,
+        including the fixed weight of the edges of each loop whose transition matrices are already known, so fragments of edges used in long or badly conditioned loops must be recovered with more precision.
+        Fragments for which the estimate was too optimistic are integrated again by `_refine_fragments`.
+        Returns the lists of working precisions and of required recovered precisions of the fragments."""
+        fragments = flatten(fragmented_edges, max_level=1)
+        N = len(fragments)
+        edge_of_fragment = flatten([[k]*len(fragmented_edges[k]) for k in range(len(fragmented_edges))])
+        first_fragment = [sum([len(f) for f in fragmented_edges[:k]]) for k in range(len(fragmented_edges))]
+
+        probed = []
+        for k, fragmented_edge in enumerate(fragmented_edges):
+            by_length = sorted(range(len(fragmented_edge)), key=lambda j: IntegratorBase._length(fragmented_edge[j]))
+            representatives = set(by_length[:probes_per_edge-1] + by_length[-1:])
+            probed += [first_fragment[k] + j for j in sorted(representatives)]
+
+        max_probe_nbits = max(self.target_bits, self.nbits)
+        loss, weights = {}, {}
+        probe_nbits = {i:initial_probe_nbits for i in probed}
+        todo = probed
+        while len(todo)>0:
+            logger.info("Probing precision loss on %d/%d fragments"% (len(todo), N))
+            result = self._integrate_fragments([fragments[i] for i in todo], [probe_nbits[i] for i in todo], strict=False)
+            failed = []
+            for i, ntm in zip(todo, result):
+                if ntm is not None:
+                    try:
+                        # the fragments are multiplied in either direction, so both the matrix and its inverse count
+                        weights[i] = max(0, Util.log2_norm(ntm), Util.log2_norm(ntm.inverse()))
+                        loss[i] = max(probe_nbits[i] - Util.recovered_bits(ntm), 0)
+                        continue
+                    except ZeroDivisionError:
+                        # the probe is too imprecise to tell that the transition matrix is invertible
+                        pass
+                if probe_nbits[i] >= max_probe_nbits:
+                    raise IntegrationError("Failed to integrate fragment [%d/%d] of operator with %d bits of precision."%(i, N, probe_nbits[i]))
+                probe_nbits[i] = 2*probe_nbits[i]
+                failed += [i]
+            todo = failed
+
+        edge_loss = [0]*len(fragmented_edges)
+        edge_fragment_weight = [0]*len(fragmented_edges)
+        for i in probed:
+            k = edge_of_fragment[i]
+            edge_loss[k] = max(edge_loss[k], loss[i])
+            edge_fragment_weight[k] = max(edge_fragment_weight[k], weights[i])
+        for i in range(N):
+            if i not in weights:
+                loss[i] = edge_loss[edge_of_fragment[i]]
+                weights[i] = edge_fragment_weight[edge_of_fragment[i]]
+
+        edge_weights = [0]*len(fragmented_edges)
+        for i in range(N):
+            edge_weights[edge_of_fragment[i]] += weights[i]
+        amplification = [0]*len(fragmented_edges)
+        for loop, fixed_weight in loops:
+            loop_weight = fixed_weight + sum([edge_weights[k] for k in loop])
+            for k in loop:
+                amplification[k] = max(amplification[k], loop_weight)
+
+        guard = self._guard_bits(N)
+        required = [self.target_bits + guard + ceil(max(amplification[edge_of_fragment[i]] - weights[i], 0)) for i in range(N)]
+        nbits = [required[i] + ceil(loss[i]) for i in range(N)]
+        logger.info("Working precision for %d digits ranges from %d to %d bits (%d bits on average)"% (self.target_digits, min(nbits), max(nbits), sum(nbits)//N))
+        return nbits, required
+
+    @staticmethod
+    def _length(fragment):
+        """The length of the polygonal line `fragment`, in double precision."""
+        CC = ComplexField(53)
+        return sum([abs(CC(fragment[j+1]) - CC(fragment[j])) for j in range(len(fragment)-1)])
+
+    def _refine_fragments(self, fragments, integration_result, nbits, required, maxtries=3):
+        """Integrates again, with a higher working precision, the fragments whose transition matrix was not recovered with the `required` precision.
+        `nbits` is updated with the working precision finally used for each fragment."""
+        guard = self._guard_bits(len(fragments))
+        for k in range(maxtries):
+            short = [i for i, ntm in enumerate(integration_result) if Util.recovered_bits(ntm) < required[i]]
+            if len(short) == 0:
+                break
+            logger.info("Recovered precision is too low on %d/%d fragments, integrating them again"% (len(short), len(fragments)))
+            for i in short:
+                nbits[i] += ceil(required[i] - Util.recovered_bits(integration_result[i])) + guard
+            redone = self._integrate_fragments([fragments[i] for i in short], [nbits[i] for i in short])
+            for i, ntm in zip(short, redone):
+                integration_result[i] = ntm
+        else:
+            if any([Util.recovered_bits(ntm) < required[i] for i, ntm in enumerate(integration_result)]):
+                logger.warning("Could not recover %d digits on all fragments after %d tries"% (self.target_digits, maxtries))
+        return integration_result
+
+    def _loops_of_edges(self, index_of_edges_to_integrate, complex_conjugates, known):
+        """Describes the pointed loops of the path structure by the indices of the edges that are actually integrated along them,
+        and the weight of the edges along them whose transition matrices are `known`, as in `_estimate_nbits`."""
+        edge_indices = {tuple(e):i for i, e in enumerate(self.voronoi.edges)}
+        representative = [None]*len(self.voronoi.edges)
+        for index, i in enumerate(index_of_edges_to_integrate):
+            e = self.voronoi.edges[i]
+            for e2 in [e, [e[1], e[0]], [complex_conjugates[e[0]], complex_conjugates[e[1]]], [complex_conjugates[e[1]], complex_conjugates[e[0]]]]:
+                if tuple(e2) in edge_indices and representative[edge_indices[tuple(e2)]] is None:
+                    representative[edge_indices[tuple(e2)]] = index
+        known_weights = {}
+        loops = []
+        for path in self.voronoi.pointed_loops:
+            loop, fixed_weight = [], 0
+            for i in range(len(path)-1):
+                e = (path[i], path[i+1])
+                j = edge_indices[e] if e in edge_indices else edge_indices[(e[1], e[0])]
+                if representative[j] is not None:
+                    loop += [representative[j]]
+                    continue
+                if j not in known_weights:
+                    known_weights[j] = max(0, Util.log2_norm(known[j].matrix), Util.log2_norm(known[j].inverse))
+                fixed_weight += known_weights[j]
+            loops += [[loop, fixed_weight]]
+        return loops
+
+    def _known_integrated_edges(self, complex_conjugates):
+        """The transition matrices along the edges of the path structure that are given in self.known_edges, or whose complex conjugates are, and None for the other edges."""
+        known = [None]*len(self.voronoi.edges)
+        for i, e in enumerate(self.voronoi.edges):
+            z0, z1 = [self.voronoi.vertices[v] for v in e]
+            if (z0, z1) in self.known_edges:
+                known[i] = self.known_edges[(z0, z1)]
+            elif (z1, z0) in self.known_edges:
+                known[i] = self.known_edges[(z1, z0)].reverse
+        edge_indices = {tuple(e):i for i, e in enumerate(self.voronoi.edges)}
+        for i, e in enumerate(self.voronoi.edges):
+            if known[i] is not None or complex_conjugates[e[0]] == None or complex_conjugates[e[1]] == None:
+                continue
+            j = edge_indices.get((complex_conjugates[e[0]], complex_conjugates[e[1]]))
+            if j is not None and known[j] is not None and j != i:
+                known[i] = known[j].conjugate
+                continue
+            j = edge_indices.get((complex_conjugates[e[1]], complex_conjugates[e[0]]))
+            if j is not None and known[j] is not None:
+                known[i] = known[j].conjugate.reverse
+        if len(self.known_edges) > 0:
+            logger.info("Reusing transition matrices along %d/%d edges"% (len([m for m in known if m is not None]), len(known)))
+        return known
+
+    @property
+    def edge_matrices(self):
+        """A dictionary mapping each edge of the path structure, given by its endpoints, to the transition matrix along it. It can be passed as `known_edges` to integrate the same operator along an updated path structure."""
+        return {tuple([self.voronoi.vertices[v] for v in e]):m for e, m in zip(self.voronoi.edges, self.integrated_edges)}
+
+    @property
+    def cost_report(self):
+        """For each integrated edge, the number of integration steps predicted by the path structure and the actual number of fragments.
+        This is None if the path structure does not predict integration costs."""
+        if not hasattr(self, "_cost_report"):
+            # checking on the class avoids computing the predicted costs when the path structure does not use them
+            if not hasattr(type(self.voronoi), "predicted_costs"):
+                self._cost_report = None
+                return self._cost_report
+            integrated_edges = self.integrated_edges
+            self._cost_report = [[self.voronoi.predicted_costs[i], len(fragments)] for i, fragments in zip(self._index_of_edges_to_integrate, self._fragmented_edges)]
+            logger.info("Predicted %d integration steps, got %d fragments"% (sum([c for c, _ in self._cost_report]), sum([n for _, n in self._cost_report])))
+        return self._cost_report
+
+    @property
+    def integrated_edges(self):
+        if not hasattr(self, "_integrated_edges"):
+            complex_conjugates = self.find_complex_conjugates()
+            integrated_edges = self._known_integrated_edges(complex_conjugates)
+            index_of_edges_to_integrate = []
+            edges_to_integrate=[]
+            for i, e in enumerate(self.voronoi.edges):
+                if integrated_edges[i] is not None:
+                    continue
+                if [e[1], e[0]] not in edges_to_integrate and [complex_conjugates[e[0]], complex_conjugates[e[1]]] not in edges_to_integrate and [complex_conjugates[e[1]], complex_conjugates[e[0]]] not in edges_to_integrate:
+                    index_of_edges_to_integrate+=[i]
+                    edges_to_integrate+=[e]
+
+            edges_to_integrate = [[self.voronoi.vertices[e[0]], self.voronoi.vertices[e[1]]] for e in edges_to_integrate]
+            N = len(edges_to_integrate)
+            
+            loops = self._loops_of_edges(index_of_edges_to_integrate, complex_conjugates, integrated_edges) if self.target_digits is not None else None
+            if N > 0:
+                integration_result = self.integrate_edges(edges_to_integrate, loops=loops)
+            else:
+                self._fragmented_input, self._fragmented_edges = [], []
+            self._index_of_edges_to_integrate = index_of_edges_to_integrate
+
+            for index, i in enumerate(index_of_edges_to_integrate):
+                integrated_edges[i] = EdgeMatrix(integration_result[index])
+                e = self.voronoi.edges[i]
+                if [complex_conjugates[e[0]], complex_conjugates[e[1]]] == e:
+                    continue
+                if [complex_conjugates[e[0]], complex_conjugates[e[1]]] in self.voronoi.edges:
+                    j = self.voronoi.edges.index([complex_conjugates[e[0]], complex_conjugates[e[1]]])
+                    integrated_edges[j] = integrated_edges[i].conjugate
+                if [complex_conjugates[e[1]], complex_conjugates[e[0]]] in self.voronoi.edges:
+                    j = self.voronoi.edges.index([complex_conjugates[e[1]], complex_conjugates[e[0]]])
+                    integrated_edges[j] = integrated_edges[i].conjugate.reverse
+
+            self._integrated_edges = integrated_edges
+            if hasattr(self.voronoi, "weight") and self.voronoi.weight == "cost":
+                # the paths were chosen from the predicted costs, so the prediction is compared with the actual integration
+                self.cost_report
+        return self._integrated_edges
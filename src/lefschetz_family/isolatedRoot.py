@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+try:
+    import sage.all
+except ImportError:
+    import sage.all__sagemath_modules
+
+from sage.rings.qqbar import QQbar
+from sage.rings.rational_field import QQ
+from sage.rings.complex_interval_field import ComplexIntervalField
+from sage.rings.complex_mpfr import ComplexField
+from sage.rings.polynomial.complex_roots import complex_roots
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RootIsolation(object):
+    def __init__(self, polynomial, prec=53):
+        """The complex roots of a squarefree univariate polynomial, given by disjoint isolating intervals.
+
+        The intervals are only refined, with interval Newton iterations, when a root is needed with more precision.
+        """
+        self._polynomial = polynomial
+        self._derivative = polynomial.derivative()
+        self._intervals = [r for r, _ in complex_roots(polynomial, min_prec=prec)]
+        self._precs = [prec]*len(self._intervals)
+
+    @property
+    def polynomial(self):
+        return self._polynomial
+
+    @property
+    def roots(self):
+        if not hasattr(self, "_roots"):
+            self._roots = [IsolatedRoot(self, i) for i in range(len(self._intervals))]
+        return self._roots
+
+    def interval(self, i, prec=53):
+        """An interval of precision at least `prec` containing the i-th root and no other root."""
+        if self._precs[i] < prec:
+            try:
+                x, converged = self._newton(self._intervals[i], prec)
+            except (ZeroDivisionError, ValueError):
+                # the derivative vanishes on the interval, or the Newton step does not meet it
+                converged = False
+            if converged:
+                self._intervals[i] = x
+                self._precs[i] = prec
+            else:
+                self._isolate(prec)
+        return self._intervals[i]
+
+    def _newton(self, x, prec, maxiter=100):
+        """Refines `x` with interval Newton iterations, and returns the refined interval together with whether its diameter reached the target."""
+        CIF = ComplexIntervalField(prec)
+        x = CIF(x)
+        eps = QQ(2)**(4-prec)
+        for k in range(maxiter):
+            m = CIF(x.center())
+            x = x.intersection(m - self.polynomial(m)/self._derivative(x))
+            if x.diameter() <= eps:
+                return x, True
+        return x, False
+
+    def _isolate(self, prec):
+        """Isolates all the roots again, with precision `prec`."""
+        logger.info("Isolating the roots of a polynomial of degree %d with %d bits of precision"% (self.polynomial.degree(), prec))
+        intervals = [r for r, _ in complex_roots(self.polynomial, min_prec=prec)]
+        refined = [None]*len(intervals)
+        for r in intervals:
+            # each old interval contains a single root, so it contains the new interval of that root
+            i = [j for j, r0 in enumerate(self._intervals) if RootIsolation._contains(r0, r)]
+            assert len(i)==1, "could not match refined roots"
+            refined[i[0]] = r
+        self._intervals = refined
+        self._precs = [prec]*len(refined)
+
+    @staticmethod
+    def _contains(x, y):
+        return x.real().lower() <= y.real().lower() and y.real().upper() <= x.real().upper() and x.imag().lower() <= y.imag().lower() and y.imag().upper() <= x.imag().upper()
+
+    def minimal_polynomial(self, i):
+        """The monic minimal polynomial over QQ of the i-th root."""
+        if not hasattr(self, "_factors"):
+            polynomial = self.polynomial
+            if polynomial.base_ring() != QQ:
+                polynomial = (polynomial*polynomial.map_coefficients(lambda c: c.conjugate())).change_ring(QQ)
+            self._factors = [f for f, _ in polynomial.factor()]
+            self._minimal_polynomials = [None]*len(self._intervals)
+        if self._minimal_polynomials[i] is None:
+            prec = 53
+            while True:
+                # the factors are coprime, so only one of them vanishes on a small enough interval
+                x = self.interval(i, prec)
+                candidates = [f for f in self._factors if f(x).contains_zero()]
+                if len(candidates) == 1:
+                    break
+                prec = 2*prec
+            self._minimal_polynomials[i] = candidates[0]
+        return self._minimal_polynomials[i]
+
+    @property
+    def conjugate_isolation(self):
+        """The RootIsolation of the complex conjugate polynomial."""
+        if not hasattr(self, "_conjugate_isolation"):
+            conjugate_polynomial = self.polynomial.map_coefficients(lambda c: c.conjugate())
+            if conjugate_polynomial == self.polynomial:
+                self._conjugate_isolation = self
+            else:
+                self._conjugate_isolation = RootIsolation(conjugate_polynomial)
+                self._conjugate_isolation._conjugate_isolation = self
+        return self._conjugate_isolation
+
+    def conjugate(self, i):
+        """The complex conjugate of the i-th root."""
+        isolation = self.conjugate_isolation
+        prec = 53
+        while True:
+            x = self.interval(i, prec).conjugate()
+            candidates = [j for j in range(len(isolation.roots)) if isolation.interval(j, prec).overlaps(x)]
+            if len(candidates) == 1:
+                return isolation.roots[candidates[0]]
+            prec = 2*prec
+
+
+class IsolatedRoot(object):
+    def __init__(self, isolation, index):
+        """A complex root of a univariate polynomial, represented by an isolating interval that is refined lazily.
+
+        It converts to complex fields, interval fields and ball fields at any precision, and to QQbar when exact comparison is unavoidable.
+        """
+        self._isolation = isolation
+        self._index = index
+
+    @property
+    def polynomial(self):
+        return self._isolation.polynomial
+
+    def interval(self, prec=53):
+        return self._isolation.interval(self._index, prec)
+
+    def conjugate(self):
+        if not hasattr(self, "_conjugate"):
+            self._conjugate = self._isolation.conjugate(self._index)
+        return self._conjugate
+
+    def minimal_polynomial(self):
+        return self._isolation.minimal_polynomial(self._index)
+
+    def real(self):
+        return self.interval().real()
+
+    def imag(self):
+        return self.interval().imag()
+
+    def _complex_mpfi_(self, field):
+        return field(self.interval(field.prec()))
+
+    def _complex_mpfr_(self, field):
+        return field(self.interval(field.prec()+10).center())
+
+    def _complex_double_(self, field):
+        return field(self.interval(63).center())
+
+    def _acb_(self, parent):
+        return parent(self.interval(parent.precision()))
+
+    def _algebraic_(self, field):
+        if not hasattr(self, "_algebraic"):
+            polynomial = self.polynomial if self.polynomial.base_ring() == QQ else self.polynomial.change_ring(QQbar)
+            self._algebraic = QQbar.polynomial_root(polynomial, self.interval())
+        return field(self._algebraic)
+
+    def __eq__(self, other):
+        if isinstance(other, IsolatedRoot):
+            if other._isolation is self._isolation:
+                return other._index == self._index
+            if not self.interval().overlaps(other.interval()):
+                return False
+            if self.minimal_polynomial() != other.minimal_polynomial():
+                return False
+            return self._algebraic_(QQbar) == other._algebraic_(QQbar)
+        if isinstance(other, str):
+            return False
+        try:
+            q = QQ(other)
+        except (TypeError, ValueError):
+            return self._algebraic_(QQbar) == QQbar(other)
+        return q in self.interval() and self.polynomial(q) == 0
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        # equal roots of different polynomials, or a root and the rational it equals, must hash alike.
+        # The minimal polynomial is exact and cheap to get, and __eq__ separates the conjugate roots sharing it.
+        if not hasattr(self, "_hash"):
+            minimal_polynomial = self.minimal_polynomial()
+            if minimal_polynomial.degree() == 1:
+                self._hash = hash(-minimal_polynomial[0])
+            else:
+                self._hash = hash(minimal_polynomial)
+        return self._hash
+
+    def _value(self, other):
+        return other.interval() if isinstance(other, IsolatedRoot) else other
+
+    def __add__(self, other):
+        return self.interval() + self._value(other)
+
+    def __radd__(self, other):
+        return self._value(other) + self.interval()
+
+    def __sub__(self, other):
+        return self.interval() - self._value(other)
+
+    def __rsub__(self, other):
+        return self._value(other) - self.interval()
+
+    def __mul__(self, other):
+        return self.interval() * self._value(other)
+
+    def __rmul__(self, other):
+        return self._value(other) * self.interval()
+
+    def __truediv__(self, other):
+        return self.interval() / self._value(other)
+
+    def __neg__(self):
+        return -self.interval()
+
+    def __abs__(self):
+        return abs(self.interval())
+
+    def __repr__(self):
+        return str(self._complex_mpfr_(ComplexField(53))) + "?"
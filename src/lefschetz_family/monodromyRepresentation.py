@@ -26,9 +26,11 @@ from sage.matrix.constructor import matrix
 from sage.rings.integer_ring import ZZ
 from sage.matrix.special import identity_matrix
 from sage.matrix.special import block_diagonal_matrix
+from sage.matrix.special import block_matrix
 from sage.matrix.special import zero_matrix
 from sage.misc.misc_c import prod
 from sage.misc.flatten import flatten
+from sage.arith.misc import gcd
 
 
 from .util import Util
@@ -96,12 +98,24 @@ class MonodromyRepresentation(object):
                     self._thimbles+=[(pc, i)]
         return self._thimbles
     
+    @property
+    def transvections(self):
+        """For each monodromy matrix M such that M-1 has rank 1, the pair of integer vectors (v, w) such that M = 1 + v*w, with v primitive; None for the other matrices."""
+        if not hasattr(self, '_transvections'):
+            self._transvections = [Util.transvection(M) for M in self.monodromy_matrices]
+        return self._transvections
+
     @property
     def permuting_cycles(self):
         if not hasattr(self, '_permuting_cycles'):
             permuting_cycles = [[] for i in range(len(self.monodromy_matrices))]
             for i in range(len(self.monodromy_matrices)):
                 M = self.monodromy_matrices[i]
+                if self.transvections[i] != None:
+                    # the image of M-1 = v*w is spanned by (w*p) v, which is minimal when w*p = gcd(w)
+                    v, w = self.transvections[i]
+                    permuting_cycles[i] = matrix([Util.bezout_vector(w)]).image().gens()
+                    continue
                 D, U, V = (M-1).smith_form()
                 for j in range(self.dim):
                     if D[j,j]!=0:
@@ -114,18 +128,22 @@ class MonodromyRepresentation(object):
     def infinity_loops(self):
         """The linear combinations of thimbles that correspond to extensions along the (trivial) loop around infinity."""
         if not hasattr(self, '_infinity_loops'):
-            infinity_cycles = []
-            for i in range(self.dim):
-                v = vector([1 if k==i else 0 for k in range(self.dim)])
-                coefs = []
-                for j in range(len(self.monodromy_matrices)):
-                    M = self.monodromy_matrices[j]
-                    if len(self.permuting_cycles[j])==0:
-                        continue
-                    coefs += list(matrix([ (M-1) * t for t in self.permuting_cycles[j]]).solve_left( (M-1) * v ))
-                    v = self.monodromy_matrices[j]*v
-                infinity_cycles+=[vector(coefs)]
-            self._infinity_loops = matrix(infinity_cycles).change_ring(ZZ).rows()
+            # the columns of X are the images of the basis vectors by the monodromy matrices encountered so far
+            X = identity_matrix(self.dim)
+            blocks = []
+            for j in range(len(self.monodromy_matrices)):
+                M = self.monodromy_matrices[j]
+                if len(self.permuting_cycles[j])==0:
+                    continue
+                if self.transvections[j] != None and len(self.permuting_cycles[j])==1:
+                    # (M-1)*x = (w*x) v, so the coefficient of x is (w*x)/(w*p)
+                    v, w = self.transvections[j]
+                    blocks += [(w.row()*X).transpose()/(w*self.permuting_cycles[j][0])]
+                else:
+                    blocks += [matrix([ (M-1) * t for t in self.permuting_cycles[j]]).solve_left( ((M-1) * X).transpose() )]
+                X = M*X
+            infinity_loops = block_matrix([blocks], subdivide=False) if len(blocks)>0 else matrix(self.dim, 0)
+            self._infinity_loops = infinity_loops.change_ring(ZZ).rows()
         return self._infinity_loops
     
     @property
@@ -142,9 +160,9 @@ class MonodromyRepresentation(object):
         if not hasattr(self, '_extensions'):
             delta = matrix(self.borders_of_thimbles).change_ring(ZZ)
             kerdelta = delta.kernel().matrix()
-            D, U, V = kerdelta.smith_form()
             infinity_loops = matrix(self.infinity_loops).image().saturation().basis() # taking saturation here. This should in principle not be necessary
-            B = D.solve_left(matrix(infinity_loops) * V).change_ring(ZZ)*U
+            # the coordinates of the infinity loops in the basis of the (saturated) kernel are integers, no Smith form is needed
+            B = kerdelta.solve_left(matrix(infinity_loops)).change_ring(ZZ)
             quotient_basis = Util.find_complement(B)
             if quotient_basis.nrows()==0:
                 self._extensions = kerdelta.submatrix(0,0,0).rows()
@@ -162,8 +180,7 @@ class MonodromyRepresentation(object):
             infinity_loops = [self.desingularise(v) for v in infinity_loops]
             delta = matrix(flatten(self.vanishing_cycles_desingularisation)).change_ring(ZZ)
             kerdelta = delta.kernel().matrix()
-            D, U, V = kerdelta.smith_form()
-            B = D.solve_left(matrix(infinity_loops) * V).change_ring(ZZ)*U
+            B = kerdelta.solve_left(matrix(infinity_loops)).change_ring(ZZ)
             quotient_basis = Util.find_complement(B)
             if quotient_basis.nrows()==0:
                 self._extensions_desingularisation = kerdelta.submatrix(0,0,0).change_ring(ZZ).rows()
@@ -173,36 +190,39 @@ class MonodromyRepresentation(object):
 
 
     def _compute_intersection_product_extensions(self):
-        r=len(self.thimbles)
         extensions = matrix(self.extensions)
-        inter_prod_thimbles = matrix([[self._compute_intersection_product_thimbles_extensions(i,j) for j in range(r)] for i in range(r)])
+        vs = [v for v, loop in self.thimbles]
+        ds = [(self.monodromy_matrices[loop]-1)*v for v, loop in self.thimbles]
+        inter_prod_thimbles = self._assemble_intersection_product_thimbles(vs, ds, [loop for v, loop in self.thimbles])
         intersection_11 = (extensions * inter_prod_thimbles * extensions.transpose()).change_ring(ZZ)
         return intersection_11
 
-    def _compute_intersection_product_thimbles_extensions(self, i, j):
-        vi, loopi = self.thimbles[i]
-        vj, loopj = self.thimbles[j]
-
-        Mi = self.monodromy_matrices[loopi]
-        Mj = self.monodromy_matrices[loopj]
-
-        di, dj = (Mi-1)*vi, (Mj-1)*vj
-
-        res = di * self.fibre_intersection_product * dj
-        resid = -vi * self.fibre_intersection_product * dj
-
-        if loopi == loopj:
-            return resid
-        if loopi < loopj:
-            return res
-        else:
-            return 0
+    def _assemble_intersection_product_thimbles(self, vs, ds, loops):
+        """Given the permuting cycles `vs` of thimbles, their boundaries `ds` and the (nondecreasing) indices `loops` of their loops, 
+        returns the matrix with entries ds[i]*IP*ds[j] if loops[i]<loops[j], -vs[i]*IP*ds[j] if loops[i]==loops[j], and 0 otherwise."""
+        r = len(vs)
+        assert all([loops[i]<=loops[i+1] for i in range(r-1)]), "thimbles are not sorted by loop"
+        IP = self.fibre_intersection_product
+        D, V = matrix(ds), matrix(vs)
+        products = D * IP * D.transpose()
+        res = zero_matrix(products.base_ring(), r)
+        s = 0
+        while s < r:
+            e = s
+            while e < r and loops[e] == loops[s]:
+                e += 1
+            if e < r:
+                res.set_block(s, e, products.submatrix(s, e, e-s, r-e))
+            res.set_block(s, s, -V.submatrix(s, 0, e-s) * IP * D.submatrix(s, 0, e-s).transpose())
+            s = e
+        return res
 
 
     def _compute_intersection_product(self):
-        r=len(flatten(self.vanishing_cycles_desingularisation))
         extensions = matrix(self.extensions_desingularisation)
-        inter_prod_thimbles = matrix([[self._compute_intersection_product_thimbles(i,j) for j in range(r)] for i in range(r)])
+        vs = self.permuting_cycles_desingularisation
+        ds = [(M-1) * v for M, v in zip(flatten(self.monodromy_matrices_desingularisation), vs)]
+        inter_prod_thimbles = self._assemble_intersection_product_thimbles(vs, ds, self.loops_of_thimbles_desingularisation)
         intersection_11 = (-1 if self.add==2 else 1) * (extensions * inter_prod_thimbles * extensions.transpose()).change_ring(ZZ)
         if self.add==2:
             intersection_02 = zero_matrix(2,2)
@@ -210,22 +230,11 @@ class MonodromyRepresentation(object):
             intersection_02[1,1] = self.self_intersection_section
             return block_diagonal_matrix(intersection_11, intersection_02)
         return intersection_11
-        
-    def _compute_intersection_product_thimbles(self,i,j):
-        vi = self.permuting_cycles_desingularisation[i]
-        Mi = flatten(self.monodromy_matrices_desingularisation)[i]
-        vj = self.permuting_cycles_desingularisation[j]
-        Mj = flatten(self.monodromy_matrices_desingularisation)[j]
-        di, dj = (Mi-1) * vi, (Mj-1) * vj
-        res = di*self.fibre_intersection_product*dj
-        resid = -vi*self.fibre_intersection_product*di
-
-        if i==j:
-            return resid
-        if i<j:
-            return res
-        else:
-            return 0
+
+    @property
+    def loops_of_thimbles_desingularisation(self):
+        """The index of the loop of each thimble of the desingularisation, for the intersection product; each of them has its own loop."""
+        return list(range(len(self.permuting_cycles_desingularisation)))
 
     
     @property
@@ -251,8 +260,12 @@ class MonodromyRepresentation(object):
             _permuting_cycles_desingularisation = []
             for i in range(len(monodromy_matrices)):
                 M = monodromy_matrices[i]
-                D, U, V = (M-1).smith_form()
-                p = V.column(0)
+                transvection = Util.transvection(M)
+                if transvection != None:
+                    p = Util.bezout_vector(transvection[1])
+                else:
+                    D, U, V = (M-1).smith_form()
+                    p = V.column(0)
                 if (M-1) * p != vanishing[i]:
                     p = -p
                 assert (M-1) * p == vanishing[i]
@@ -287,9 +300,19 @@ class MonodromyRepresentation(object):
     @property
     def vanishing_cycles_desingularisation(self):
         if not hasattr(self, '_vanishing_cycles_desingularisation'):
-            self._vanishing_cycles_desingularisation = [[(M-1).transpose().image().gens()[0] for M in Ms] for Ms in self.monodromy_matrices_desingularisation]
+            self._vanishing_cycles_desingularisation = [[self._vanishing_cycle(M) for M in Ms] for Ms in self.monodromy_matrices_desingularisation]
         return self._vanishing_cycles_desingularisation
     
+    @staticmethod
+    def _vanishing_cycle(M):
+        """The generator of the image of M-1 with positive leading coefficient."""
+        transvection = Util.transvection(M)
+        if transvection == None:
+            return (M-1).transpose().image().gens()[0]
+        v, w = transvection
+        u = gcd(w.list())*v
+        return u if [c for c in u if c!=0][0]>0 else -u
+
     @property
     def borders_of_thimbles(self):
         if not hasattr(self, '_borders_of_thimbles'):
@@ -147,27 +147,10 @@ class MonodromyRepresentationFibreProduct(MonodromyRepresentation):
         return self._monodromy_matrices_desingularisation
 
 
-    def _compute_intersection_product_thimbles(self,i,j):
-        vi = self.permuting_cycles_desingularisation[i]
-        vj = self.permuting_cycles_desingularisation[j]
-
-        Mi = flatten(self.monodromy_matrices_desingularisation)[i]
-        Mj = flatten(self.monodromy_matrices_desingularisation)[j]
-        
-        di, dj = (Mi-1) * vi, (Mj-1) * vj
-
-        res = di * self.fibre_intersection_product * dj
-        resid = -vi * self.fibre_intersection_product * dj
-
-        loopi = i//2
-        loopj = j//2
-
-        if loopi==loopj:
-            return resid
-        if loopi<loopj:
-            return res
-        else:
-            return 0
+    @property
+    def loops_of_thimbles_desingularisation(self):
+        """Thimbles of the desingularisation come in pairs sharing the same loop."""
+        return [i//2 for i in range(len(self.permuting_cycles_desingularisation))]
 
     @property
     def intersection_product_resolution(self):
@@ -35,6 +35,7 @@ from . import interpolation
 from . import cohomology
 from . import config
 from ..exceptions import FailFast
+from ..floatVoronoi import FloatVoronoiDiagram
 
 logger = logging.getLogger(__name__)
 
@@ -376,6 +377,11 @@ class Family(object):
         rootapprox.add((QQ(0), QQ(10))) # To ensure that there is always a path.
         rootapprox.add((QQ(0), QQ(10)))
 
+        gr = self._path_graph_float(list(rootapprox))
+        if gr is not None:
+            return gr
+        logger.info("Falling back to exact computation of the Voronoi diagram.")
+
         vd = VoronoiDiagram(rootapprox)
 
         # We fill a graph. The vertices are points in the complex plane (including 0 and 1).
@@ -401,6 +407,37 @@ class Family(object):
 
         return gr
 
+    def _path_graph_float(self, rootapprox):
+        """Same as `_path_graph`, with a Voronoi diagram computed in double precision.
+        Returns None if the diagram cannot be trusted."""
+        fvd = FloatVoronoiDiagram(rootapprox)
+        # the closest pair of points is an edge of the Delaunay triangulation
+        closest = min(CDF(complex(*fvd.points[e[0]]) - complex(*fvd.points[e[1]])).abs() for e in fvd.dual_edges)
+        tol = closest/10**4
+        regions = fvd.regions(tol)
+        if regions is None:
+            return None
+        fvertices, cells, cell_vertices = regions
+
+        RIF = RealIntervalField(53)
+        vertices = [RIF(x-tol, x+tol).simplest_rational() + I*RIF(y-tol, y+tol).simplest_rational() for x, y in fvertices]
+
+        gr = Graph()
+        for i, pt_ in enumerate(rootapprox):
+            pt = pt_[0] + I*pt_[1]
+            ptc = CDF(pt)
+            for edge in cells[i]:
+                u, v = vertices[edge[0]], vertices[edge[1]]
+                uc, vc = CDF(*fvertices[edge[0]]), CDF(*fvertices[edge[1]])
+                ratio = (uc-vc).abs()/min((ptc-uc).abs(), (ptc-vc).abs(), (ptc-(uc+vc)/2).abs())
+                gr.add_edge(u, v, label=float(ratio))
+
+            if pt == 0 or pt == 1:
+                for k in cell_vertices[i]:
+                    gr.add_edge(pt, vertices[k], 1.0)
+
+        return gr
+
     @cached_method
     def _nice_path(self, only_holomorphic_forms=False):
         logger.info("Computing a nice path for integration.")
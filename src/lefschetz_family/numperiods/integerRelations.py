@@ -22,10 +22,13 @@ class PrecisionError(Exception):
 
 class IntegerRelations(object):
     def __init__(self, mat, beta=None, threshold=None, min_threshold=10**3,
-                 algorithm='fpLLL:proved', fp='xd', **kwd):
+                 algorithm='fpLLL:proved', fp='xd', progressive=False, **kwd):
         """`mat` is a matrix with real/complex ball/interval coefficients. This class
         computes the lattice of integer relations between the rows of mat.
 
+        If `progressive` is True, the lattice is first reduced with a heuristic LLL at increasing
+        precisions, each reduction starting from the previous one, and `algorithm` is only run
+        at full precision on the resulting, almost reduced, lattice.
         """
 
         logger.info("Computing lattice of integer relations (ambient dimension %d, number of relations %d)."
@@ -64,12 +67,18 @@ class IntegerRelations(object):
             logger.info("log(threshold) = %s (forced by caller)", RR(threshold).log(10))
 
 
+        imat = self._imat
         self._imat = (self._beta*self._imat).apply_map(lambda x : x.center().round())
 
         self._rawlat = Matrix.block([[self._imat, Matrix.identity(ZZ, m)]])
 
+        if progressive:
+            lattice = self._progressive_transformation(imat, fp)*self._rawlat
+        else:
+            lattice = self._rawlat
+
         logger.info("Running LLL...")
-        self._redlat = self._rawlat.LLL(delta=0.75, algorithm=algorithm, fp=fp, **kwd)
+        self._redlat = lattice.LLL(delta=0.75, algorithm=algorithm, fp=fp, **kwd)
         self._norms = [r.norm() for r in self._redlat.change_ring(RR).rows()]
 
         self.rank = len([n for n in self._norms if n < threshold])
@@ -99,6 +108,22 @@ class IntegerRelations(object):
 
         self.basis = self._redlat[:self.rank, nrels:]
 
+    def _progressive_transformation(self, imat, fp, minbits=64):
+        """Returns the unimodular transformation obtained by reducing the lattice of relations with increasing precisions (starting from `minbits` bits and doubling),
+        each time starting from the previous transformation."""
+        m = imat.nrows()
+        bits = ZZ(self._beta).nbits()
+        transformation = Matrix.identity(ZZ, m)
+        b = max(minbits, bits//16)
+        while b < bits:
+            logger.info("Running heuristic LLL with %d bits..." % b)
+            scaled = (2**b*imat).apply_map(lambda x : x.center().round())
+            lattice = transformation*Matrix.block([[scaled, Matrix.identity(ZZ, m)]])
+            reduced = lattice.LLL(delta=0.75, algorithm='fpLLL:heuristic', fp=fp)
+            transformation = reduced[:, imat.ncols():]
+            b = 2*b
+        return transformation
+
     def basis_elements(self):
         self.basis_matrix().rows()
 
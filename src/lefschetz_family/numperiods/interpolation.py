@@ -332,6 +332,8 @@ class ModularReconstruction:
             pt += 1
             prime = random_prime(self.maxprime, lbound=self.maxprime/128)
             key = self._next(prime)
+            if key is None:
+                continue
 
             # We don't always try reconstruction (it is expensive)
             if self.tick.tick():
@@ -343,10 +345,14 @@ class ModularReconstruction:
 class FunctionReconstruction:
     logger = logging.getLogger('numperiods.interpolation.FunctionReconstruction')
 
-    def __init__(self, polring, evaluator):
+    def __init__(self, polring, evaluator, batch_evaluator=None, batchsize=8):
+        """If `batch_evaluator` is given, it is called on lists of `batchsize` points (for instance to evaluate them in parallel)
+        and returns the list of the evaluations, with None for bad evaluations."""
         self.polring = polring
         self.serial = Serial()
         self.evaluator = evaluator
+        self.batch_evaluator = batch_evaluator
+        self.batchsize = batchsize
 
         self.tick = Tick()
         self.data = {}
@@ -368,6 +374,12 @@ class FunctionReconstruction:
         except ZeroDivisionError:
             self.logger.info("Bad evaluation, skipping this value.")
             return
+        return self._record(pt, ev)
+
+    def _record(self, pt, ev):
+        if ev is None:
+            self.logger.info("Bad evaluation, skipping this value.")
+            return
 
         data, struct = self.serial.explode(ev)
         key = struct
@@ -392,6 +404,8 @@ class FunctionReconstruction:
         return key
 
     def recons(self, denomapart=False):
+        if not self.batch_evaluator is None:
+            return self._recons_batch(denomapart=denomapart)
         pt = Integer(100)
         while True:
             pt += 1
@@ -404,6 +418,23 @@ class FunctionReconstruction:
                     return cand
 
 
+    def _recons_batch(self, denomapart=False):
+        pt = Integer(100)
+        while True:
+            pts = [pt + i for i in range(1, self.batchsize+1)]
+            pt += self.batchsize
+            self.logger.info("Evaluating at %i to %i" % (pts[0], pts[-1]))
+            keys = [self._record(p, ev) for p, ev in zip(pts, self.batch_evaluator(pts))]
+            keys = [key for key in keys if not key is None]
+            if len(keys) == 0:
+                continue
+
+            # We try reconstruction once per batch, for the most common key
+            key = max(set(keys), key=keys.count)
+            cand = self._try_reconstruction(key, denomapart=denomapart)
+            if not cand is None:
+                return cand
+
     def _try_reconstruction(self, key, denomapart=False):
         self.logger.info("Trying rational reconstruction...")
 
@@ -436,7 +467,7 @@ class FunctionReconstruction:
             elt = ei.interpolate([self.data[key][p][i]*evdenom[idx] for idx, p in enumerate(points)])
             if 3*elt.degree() > 2*len(points):
                 self.logger.warn("The random sampling failed. Should happen very rarely.")
-                self.__init__(self.polring, self.evaluator)
+                self.__init__(self.polring, self.evaluator, self.batch_evaluator, self.batchsize)
                 return None
             if denomapart:
                 cand.append(elt)
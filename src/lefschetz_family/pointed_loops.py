@@ -29,99 +29,140 @@ from sage.matrix.constructor import matrix
 from .util import Util
 
 class PointedLoop(object):
+    __slots__ = ["_path"]
+
     def __init__(self, path):
         assert path[0] == path[-1], "given path is not a loop"
-        self.path = Util.simplify_path(path)
+        self._path = tuple(Util.simplify_path(path))
+
+    @staticmethod
+    def _from_reduced(path):
+        """Builds a PointedLoop from a tuple that is already a reduced loop, without copying it."""
+        loop = PointedLoop.__new__(PointedLoop)
+        loop._path = path
+        return loop
+
+    @staticmethod
+    def _concatenate(path1, path2):
+        """Concatenates two reduced loops with the same basepoint, removing the backtracking at the junction only."""
+        i, j = len(path1)-1, 0
+        while i>0 and j<len(path2)-1 and path1[i-1] == path2[j+1]:
+            i, j = i-1, j+1
+        return path1[:i+1] + path2[j+1:]
+
+    @property
+    def path(self):
+        return list(self._path)
     
     def __str__(self):
         s = str(self.path)
         if len(s)>=100:
             s = s[:50] + "..." + s[-50:]
-        return "loop pointed at " + str(self.path[0]) +" along " + s
+        return "loop pointed at " + str(self._path[0]) +" along " + s
     def __repr__(self):
         s = str(self.path)
         if len(s)>=100:
             s = s[:50] + "..." + s[-50:]
-        return "loop pointed at " + str(self.path[0]) +" along " + s
+        return "loop pointed at " + str(self._path[0]) +" along " + s
     
     def __add__(self, other):
-        return PointedLoop(self.path + other.path)
+        return PointedLoop._from_reduced(PointedLoop._concatenate(self._path, other._path))
     def __radd__(self, other):
         if other==0:
             return self
-        return PointedLoop(self.path + other.path)
+        return PointedLoop._from_reduced(PointedLoop._concatenate(other._path, self._path))
         
     def __sub__(self, other):
-        return PointedLoop(self.path + list(reversed(other.path)))
+        return PointedLoop._from_reduced(PointedLoop._concatenate(self._path, other._path[::-1]))
 
     def __neg__(self):
-        return PointedLoop(list(reversed(self.path)))
+        return PointedLoop._from_reduced(self._path[::-1])
     
     def __rmul__(self, other):
-        if other ==0:
-            return PointedLoop([self.path[0]])
-        if other >0:
-            return PointedLoop(self.path * other)
-        if other <0:
-            return PointedLoop(list(reversed(self.path)) * -other)
+        return self.__mul__(other)
         
     def __mul__(self, other):
         if other ==0:
-            return PointedLoop([self.path[0]])
-        if other >0:
-            return PointedLoop(self.path * other)
-        if other <0:
-            return PointedLoop(list(reversed(self.path)) * -other)
+            return PointedLoop._from_reduced(self._path[:1])
+        path = self._path if other>0 else self._path[::-1]
+        res = path
+        for k in range(abs(other)-1):
+            res = PointedLoop._concatenate(res, path)
+        return PointedLoop._from_reduced(res)
     
     def __iter__(self):
-        return iter(self.path)
+        return iter(self._path)
 
     def draw(self, basepoint_free=False, **kwds):
         from sage.plot.plot import list_plot
         if not basepoint_free:
-            return list_plot([[c.real(), c.imag()] for c in self.path], True, **kwds)
+            return list_plot([[c.real(), c.imag()] for c in self._path], True, **kwds)
             
-        path = self.path[len(self.path)//2:] + self.path[:len(self.path)//2]
+        path = self.path[len(self._path)//2:] + self.path[:len(self._path)//2]
         path = Util.simplify_path(path) + [path[0]]
         return list_plot([[c.real(), c.imag()] for c in path], True, **kwds)
     
     def __getitem__(self, i):
-        return self.path[i]
+        if isinstance(i, slice):
+            return list(self._path[i])
+        return self._path[i]
     
     def __len__(self):
-        return len(self.path)
+        return len(self._path)
 
     @property
     def edges(self):
         edges = []
-        for i in range(len(self.path)-1):
-            edges += [self.path[i:i+2]]
+        for i in range(len(self._path)-1):
+            edges += [list(self._path[i:i+2])]
         return edges
     
 def simplify_conjugation(path_indices):
-    res = path_indices.copy()
-    i=0
-    while i<len(res)-1:
-        if res[i][0] == res[i+1][0]:
-            newp = res[i][1]+res[i+1][1]
-            if newp==0:
-                res = res[:i]+res[i+2:]
-                i=max(i-1,0)
-            else:
-                res = res[:i]+[(res[i][0], newp)]+res[i+2:]
+    res = []
+    for i, p in path_indices:
+        if len(res)>0 and res[-1][0] == i:
+            newp = res[-1][1]+p
+            res.pop()
+            if newp!=0:
+                res.append((i, newp))
         else:
-            i+=1
+            res.append((i, p))
     return res
 
 class LoadedPointedLoop(object):
+    __slots__ = ["fibration", "_letters"]
+
     def __init__(self, fibration, letters):
-        self.letters = simplify_conjugation(letters)
+        self._letters = tuple(simplify_conjugation(letters))
         self.fibration = fibration
 
+    @staticmethod
+    def _from_reduced(fibration, letters):
+        """Builds a LoadedPointedLoop from a tuple of letters that is already simplified, without copying it."""
+        loop = LoadedPointedLoop.__new__(LoadedPointedLoop)
+        loop._letters = letters
+        loop.fibration = fibration
+        return loop
+
+    @staticmethod
+    def _concatenate(letters1, letters2):
+        """Concatenates two simplified words, simplifying at the junction only."""
+        i, j = len(letters1), 0
+        while i>0 and j<len(letters2) and letters1[i-1][0] == letters2[j][0]:
+            newp = letters1[i-1][1] + letters2[j][1]
+            if newp!=0:
+                return letters1[:i-1] + ((letters2[j][0], newp),) + letters2[j+1:]
+            i, j = i-1, j+1
+        return letters1[:i] + letters2[j:]
+
+    @property
+    def letters(self):
+        return self._letters
+
     def __add__(self, other):
         if other == 0:
             return self
-        return LoadedPointedLoop(self.fibration, self.letters + other.letters)
+        return LoadedPointedLoop._from_reduced(self.fibration, LoadedPointedLoop._concatenate(self._letters, other._letters))
     def __radd__(self, other):
         return self.__add__(other)
         
@@ -129,46 +170,43 @@ class LoadedPointedLoop(object):
         return self.__add__(-other)
         
     def __neg__(self):
-        newletters = []
-        for (i,p) in self.letters:
-            newletters = [(i,-p)] + newletters
-        return LoadedPointedLoop(self.fibration, newletters)
+        return LoadedPointedLoop._from_reduced(self.fibration, tuple((i,-p) for (i,p) in reversed(self._letters)))
         
        
     def conjugate(self, other):
         return other + self - other
 
     def __repr__(self):
-        s = str(self.letters)
+        s = str(list(self._letters))
         if len(s)>200:
             s = s[:50] + "<...>" + s[-50:]
         return "loaded loop with representation " + s
         
     def __str__(self):
-        s = str(self.letters)
+        s = str(list(self._letters))
         if len(s)>200:
             s = s[:50] + "<...>" + s[-50:]
         return "loaded loop with representation " + s
     
     def __len__(self):
-        return len(self.letters)
+        return len(self._letters)
         
     def __getitem__(self, index):
         if isinstance(index, slice):
-            # Return a new Foo with the sliced list
-            return LoadedPointedLoop(self.fibration, self.letters[index])
+            # a slice of a simplified word is simplified
+            return LoadedPointedLoop._from_reduced(self.fibration, self._letters[index])
         else:
             # Return a single item
-            return self.letters[index]
+            return self._letters[index]
 
     def __iter__(self):
-        return iter(self.letters)
+        return iter(self._letters)
 
     def __contains__(self, item):
-        return item in self.letters
+        return item in self._letters
 
     def index(self, item):
-        return self.letters.index(item)
+        return self._letters.index(item)
         
     @property
     def monodromy_matrix(self):
@@ -240,12 +278,15 @@ class HomotopyRepresentation(object):
         return HomotopyRepresentation(self.fibration, loaded_paths=indices)
 
     def act_by_braids(self, list_of_braids):
-        res = self
+        loaded_paths = list(self.loaded_paths) # the generators are applied in place, on a single copy
         for i, n in list_of_braids:
-            p = -1 if n<0 else 1
+            assert i<len(loaded_paths)-1, "braid index is too high"
             for j in range(abs(n)):
-                res = res.act_by_braid(i, p)
-        return res
+                if n>0:
+                    loaded_paths[i], loaded_paths[i+1] = loaded_paths[i+1].conjugate(loaded_paths[i]), loaded_paths[i]
+                else:
+                    loaded_paths[i], loaded_paths[i+1] = loaded_paths[i+1], loaded_paths[i].conjugate(-loaded_paths[i+1])
+        return HomotopyRepresentation(self.fibration, loaded_paths=loaded_paths)
 
     @property
     def length(self):
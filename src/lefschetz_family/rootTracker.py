@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# lefschetz-family
+# Copyright (C) 2021  Eric Pichon-Pharabod
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+try:
+    import sage.all
+except ImportError:
+    import sage.all__sagemath_modules
+
+from sage.rings.rational_field import QQ
+from sage.rings.real_mpfi import RealIntervalField
+from sage.rings.complex_interval_field import ComplexIntervalField
+from sage.rings.complex_mpfr import ComplexField
+from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+
+from .exceptions import TrackingError
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RootTracker(object):
+    def __init__(self, P, additional_points=[], prec=53, maxprec=1024, minstep=2**-40):
+        """P, a polynomial in two variables u and t.
+
+        This class follows all the roots (in t) of P(u) together as u moves along a segment, with a single adaptive step size.
+        Each step is certified with an interval Newton test on the whole vector of roots:
+        for all u in the step, each root stays in its own box, and these boxes are disjoint and avoid the additional points.
+        """
+        self.P = P
+        self.additional_points = additional_points
+        self.prec = prec
+        self.maxprec = maxprec
+        self.minstep = minstep
+
+    def track(self, u0, u1, roots):
+        """Given the roots of P(u0), returns for each of them a list of triples [s, x, r] such that, 
+        linearly interpolated, the points x are isotopic to the thread of this root as u goes from u0 to u1 = u0 + s(u1-u0), 0<=s<=1.
+        On the step ending at s, the root stays within distance r of the interpolated positions."""
+        prec = self.prec
+        while prec <= self.maxprec:
+            threads = self._track(u0, u1, roots, prec)
+            if threads != None:
+                return threads
+            prec = 2*prec
+            logger.info("[RootTracker] Step size became too small, increasing precision to %d bits."% prec)
+        raise TrackingError("could not track roots along segment, even with %d bits of precision"% self.maxprec)
+
+    def _track(self, u0, u1, roots, prec):
+        CIF = ComplexIntervalField(prec)
+        RIF = RealIntervalField(prec)
+        CF = ComplexField(prec)
+
+        Ri = PolynomialRing(CIF, ['s','t'])
+        s, t = Ri.gens()
+        Qi = self.P.change_ring(CIF)(CIF(u0) + s*(CIF(u1)-CIF(u0)), t)
+        Qit = Qi.derivative(t)
+        Rc = PolynomialRing(CF, ['s','t'])
+        s, t = Rc.gens()
+        Qc = self.P.change_ring(CF)(CF(u0) + s*(CF(u1)-CF(u0)), t)
+        Qct, Qcs = Qc.derivative(t), Qc.derivative(s)
+        fixed = [CF(p) for p in self.additional_points]
+
+        x = [CF(r) for r in roots]
+        threads = [[[QQ(0), r, 0]] for r in x]
+        s0, h = QQ(0), QQ(1)/16
+        while s0 < 1:
+            h = min(h, 1-s0)
+            if h < self.minstep:
+                return None
+            s1 = s0 + h
+
+            # Euler predictor followed by a few Newton corrections
+            xp = [r - h*Qcs(s0, r)/Qct(s0, r) for r in x]
+            for k in range(3):
+                xp = [r - Qc(s1, r)/Qct(s1, r) for r in xp]
+
+            radii = self._certify(Qi, Qit, RIF(s0, s1), x, xp, fixed, CIF, RIF)
+            if radii != None:
+                for thread, r, radius in zip(threads, xp, radii):
+                    thread += [[s1, r, radius]]
+                x = xp
+                s0 = s1
+                h = 2*h
+            else:
+                h = h/2
+        return threads
+
+    @staticmethod
+    def _certify(Qi, Qit, S, x, xp, fixed, CIF, RIF):
+        """Checks that for every s in S, the box around the segment [x[j], xp[j]] contains exactly one root of Qi(s), and that these boxes are disjoint and avoid `fixed`.
+        Returns, for each root, a bound on its distance to the points of the segment [x[j], xp[j]] for every s in S, or None if the check fails.
+        The bound is taken from the Newton enclosure of the root, which is usually much smaller than its box."""
+        boxes = []
+        for j, (a, b) in enumerate(zip(x, xp)):
+            distances = [abs(a-c) for k, c in enumerate(x) if k!=j] + [abs(a-c) for c in fixed]
+            separation = min(distances) if len(distances)>0 else 1
+            r = abs(b-a)/2 + separation/8
+            c = (a+b)/2
+            boxes += [CIF(RIF(c.real()-r, c.real()+r), RIF(c.imag()-r, c.imag()+r))]
+
+        for j in range(len(boxes)):
+            for k in range(j):
+                if boxes[j].overlaps(boxes[k]):
+                    return None
+            for c in fixed:
+                if boxes[j].overlaps(CIF(c)):
+                    return None
+
+        radii = []
+        for X, a, b in zip(boxes, x, xp):
+            m = CIF(X.center())
+            derivative = Qit(S, X)
+            if derivative.contains_zero():
+                return None
+            N = m - Qi(S, m)/derivative
+            if not RootTracker._strictly_inside(N, X):
+                return None
+            # the root lies in N, and the distance from a point of N to the segment is at most its distance to the farthest end
+            radii += [max(float((N - CIF(a)).abs().upper()), float((N - CIF(b)).abs().upper()))]
+        return radii
+
+    @staticmethod
+    def _strictly_inside(N, X):
+        return X.real().lower() < N.real().lower() and N.real().upper() < X.real().upper() and X.imag().lower() < N.imag().lower() and N.imag().upper() < X.imag().upper()
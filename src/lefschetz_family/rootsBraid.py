@@ -39,6 +39,12 @@ from sage.parallel.decorate import parallel
 
 
 from .util import Util
+from .rootTracker import RootTracker
+from .braidThread import BraidThread
+from .freeGroupAutomorphism import FreeGroupAutomorphism
+from .exceptions import TrackingError
+
+import numpy as np
 
 import logging
 import time
@@ -88,7 +94,7 @@ class RootsBraid(object):
             t = self.P.parent()('t')
             discrP = self.P.discriminant(t)
             Qu=PolynomialRing(QQ[I], 'u')
-            self._singularities = Qu(discrP).roots(QQbar, multiplicities=False)
+            self._singularities = Util.roots(Qu(discrP), multiplicities=False)
         return self._singularities
     
     def system(self, i):
@@ -101,7 +107,7 @@ class RootsBraid(object):
             Qt=PolynomialRing(QQ[I], 't')
             p = self.vertices[i]
             u,t = self.P.parent()('u'),self.P.parent()('t')
-            roots = Qt(self.P(u=p)).roots(QQbar, multiplicities=False)
+            roots = Util.roots(Qt(self.P(u=p)), multiplicities=False)
             roots = [CC(r)for r in roots]
             roots.sort(key=lambda z: (z.real(), z.imag()))
             self._systems[i] = roots
@@ -145,19 +151,14 @@ class RootsBraid(object):
 
     @parallel
     def _compute_braid(self, e, i):
-        from sage.schemes.curves.zariski_vankampen import followstrand
         logger.info("[%d] Computing braid along edge %d"% (os.getpid(), i))
         begin = time.time()
         roots = self.system(e[0])
-        res=[]
-        j=0
-        steps = [begin]
-        for r in roots:   
-            j+=1
-            # logger.info("[%d] Computing thread %d of edge %d."% (os.getpid(), j, i))
-            line = followstrand(self.P, [z.minpoly()(self.P.parent().gens()[1]) for z in self.additional_points], self.vertices[e[0]], self.vertices[e[1]],r, 50)
-            res+=  [[[c[0], c[1]+I*c[2]] for c in line]]
-            steps += [time.time()]
+        try:
+            res = RootTracker(self.P, self.additional_points).track(self.vertices[e[0]], self.vertices[e[1]], roots)
+        except TrackingError:
+            logger.info("[%d] Could not track roots simultaneously along edge %d, following them one by one."% (os.getpid(), i))
+            res = self._follow_strands(e)
         
         end = time.time()
         duration = end-begin
@@ -165,24 +166,26 @@ class RootsBraid(object):
         if end-begin >= 24*60*60:
             ndays = (end-begin)//24*60*60
             duration_str = str(ndays)+"d "+duration_str
-        duration_str_steps = ' '.join([time.strftime("%H:%M:%S",time.gmtime(steps[i]-steps[i-1])) for i in range(1, len(steps))])
-        logger.info("[%d] Finished computation of braid along edge %d. [total time:%s], [per root: %s]."% (os.getpid(), i, duration_str, duration_str_steps))
+        logger.info("[%d] Finished computation of braid along edge %d. [total time:%s], [steps: %d]."% (os.getpid(), i, duration_str, len(res[0])-1 if len(res)>0 else 0))
 
-        resinverse = [list(reversed([[1-t, x] for t, x in thread])) for thread in res]
+        res = [BraidThread.from_points(thread) for thread in res]
+        resinverse = [thread.reverse() for thread in res]
         rootsinverse = self.system(e[1])
         endthreads = [thread[0][1] for thread in resinverse]
-        order = [Util.select_closest_index(endthreads, r) for r in rootsinverse]
+        order = Util.select_closest_indices(endthreads, rootsinverse)
         resinverse = [resinverse[i] for i in order]
         return res,resinverse
 
+    def _follow_strands(self, e):
+        """Follows the roots of self.system(e[0]) one by one along the edge e with `followstrand`, and returns their threads as lists of pairs [t, x]."""
+        res = []
+        for r in self.system(e[0]):
+            line = followstrand(self.P, [z.minpoly()(self.P.parent().gens()[1]) for z in self.additional_points], self.vertices[e[0]], self.vertices[e[1]], r, 50)
+            res += [[[c[0], c[1]+I*c[2]] for c in line]]
+        return res
+
     def interpolate(self, thread, t):
-        if t==1:
-            return thread[-1][1]
-        for i in range(len(thread)-1,-1,-1):
-            if t>=thread[i][0]:
-                break
-        t0,x0, t1,x1 = thread[i][0], thread[i][1], thread[i+1][0], thread[i+1][1]
-        return ((t1-t)*x0+ (t-t0)*x1)/(t1-t0)
+        return ComplexField(53)(thread(float(t)))
 
 
     def minimal_cover_tree(self, section):
@@ -190,8 +193,16 @@ class RootsBraid(object):
         mtc=Graph(self.npoints+1) 
         edges = flatten([[(i,j) for i in range(j)] for j in range(self.npoints)], max_level=1) 
         edges.sort(key=(lambda e: Util.simple_rational(abs(CC(section[e[0]]-section[e[1]])), 10e-10))) # we sort edges by length
+        components = list(range(self.npoints)) # union-find structure of the forest built so far
+        def find(v):
+            while components[v] != v:
+                components[v] = components[components[v]]
+                v = components[v]
+            return v
         for e in edges:
-            if len(mtc.shortest_path(e[0], e[1]))==0:
+            c0, c1 = find(e[0]), find(e[1])
+            if c0 != c1:
+                components[c0] = c1
                 mtc.add_edge(e)
         # then we add the path to the basepoint
         vertices = [i for i in range(self.npoints)]
@@ -218,18 +229,90 @@ class RootsBraid(object):
         return section+self.additional_points
 
     def raffine_braid(self, braid):
-        ts=[]
-        for thread in braid:
-            for p in thread:
-                ts+=[p[0]]
-        ts = list(set(ts))
-        ts.sort()
+        ts, positions = self._refined_positions(braid)
+        CC = ComplexField(53)
+        return [[CC(x) for x in positions[:len(braid), k]] + self.additional_points for k in range(len(ts))]
+
+    def _refined_positions(self, braid):
+        """Returns the refined times of the braid, and the array of the positions of all the points (including additional points) at these times.
+        Raises a TrackingError if the threads, within their radii, are not certified to stay apart from each other and from the additional points."""
+        ts = np.unique(np.concatenate([thread.ts for thread in braid]))
+        step = float(self._maximalstep)
+        refined = [ts]
         for t0,t1 in zip(ts[:-1], ts[1:]):
-            while t1-t0>1.1*self._maximalstep:
-                t0+=self._maximalstep
-                ts.append(t0)
-        ts.sort()
-        return [self.braid_section(braid, t) for t in ts]
+            n = int(np.ceil((t1-t0)/step - 1.1)) # number of t0+k*step such that t1-(t0+(k-1)*step)>1.1*step
+            if n>0:
+                refined += [t0 + step*np.arange(1, n+1)]
+        ts = np.sort(np.concatenate(refined))
+
+        # all the threads are interpolated at once, with a binary search for each time
+        positions = np.array([thread(ts) for thread in braid])
+        CC = ComplexField(53)
+        fixed = np.array([[complex(CC(p))]*len(ts) for p in self.additional_points]).reshape(len(self.additional_points), len(ts))
+        positions = np.concatenate([positions.reshape(len(braid), len(ts)), fixed])
+
+        # on each interval between consecutive times, two threads must stay further apart than the sum of their radii
+        midpoints = (ts[:-1]+ts[1:])/2
+        radii = np.concatenate([np.array([thread.radius(midpoints) for thread in braid]).reshape(len(braid), len(midpoints)), np.zeros((len(self.additional_points), len(midpoints)))])
+        for j in range(len(braid)):
+            # the difference between two threads is linear on each interval, so its smallest modulus is reached at an end or at the projection of 0
+            d = positions[j+1:] - positions[j]
+            d0, dd = d[:, :-1], d[:, 1:] - d[:, :-1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                l = np.nan_to_num(np.clip(-np.real(d0*np.conj(dd))/np.abs(dd)**2, 0, 1))
+            separation = np.abs(d0 + l*dd)
+            margin = radii[j+1:] + radii[j]
+            if np.any(separation <= margin):
+                k, m = np.unravel_index(np.argmax(margin - separation), separation.shape)
+                raise TrackingError("thread %d is not separated from point %d between times %f and %f (separation %.3e, radii %.3e)"% (j, j+1+k, ts[m], ts[m+1], separation[k, m], margin[k, m]))
+        return ts, positions
+
+    def _next_event(self, mtc, positions, k, tol=1e-8, chunk=256):
+        """Returns the first index k1>k such that `mtc` is not certified to be the minimal cover tree of the section at k1, or None if there is none.
+
+        Between k and k1, every edge outside the tree is longer than the edges of the tree along the path between its ends, 
+        and the vertex linked to the basepoint remains the closest one, with a margin of `tol` that absorbs rounding.
+        """
+        n = self.npoints
+        forest = Graph(n)
+        v0 = None
+        for e in mtc.edges(labels=False):
+            if n in e:
+                v0 = e[0] if e[1]==n else e[1]
+            else:
+                forest.add_edge(e)
+        pairs = flatten([[(i,j) for i in range(j)] for j in range(n)], max_level=1)
+        index = {e:l for l, e in enumerate(pairs)}
+        I = np.array([e[0] for e in pairs], dtype=int)
+        J = np.array([e[1] for e in pairs], dtype=int)
+
+        # each edge outside the tree must be longer than the tree edges it would replace
+        E, F = [], []
+        for (i,j) in pairs:
+            if forest.has_edge(i,j):
+                continue
+            path = forest.shortest_path(i,j)
+            for a, b in zip(path[:-1], path[1:]):
+                E += [index[(i,j)]]
+                F += [index[(min(a,b), max(a,b))]]
+        E, F = np.array(E, dtype=int), np.array(F, dtype=int)
+        others = np.array([v for v in range(n) if v!=v0], dtype=int)
+        if self.hasbasepoint:
+            CC = ComplexField(53)
+            basepoint = complex(CC(self.basepoint))
+
+        for start in range(k+1, positions.shape[1], chunk):
+            section = positions[:, start:start+chunk]
+            D = np.abs(section[I] - section[J])
+            violated = np.any(D[E] <= D[F] + tol, axis=0) if len(E)>0 else np.zeros(section.shape[1], dtype=bool)
+            if self.hasbasepoint:
+                Db = np.abs(section - basepoint)
+                violated |= np.any(Db[others] <= Db[v0] + tol, axis=0)
+            else:
+                violated |= np.any(section[others].real <= section[v0].real + tol, axis=0)
+            if np.any(violated):
+                return start + int(np.argmax(violated))
+        return None
 
 
     def isomorphisms(self, e):
@@ -276,31 +359,46 @@ class RootsBraid(object):
     def _compute_isomorphism(self, e):
         i, inverse = self.edge(e)
         braid = self.braid(e)
-        sections = self.raffine_braid(braid)
+        try:
+            ts, positions = self._refined_positions(braid)
+        except TrackingError as error:
+            logger.info("[%d] Braid %d is not certified in double precision (%s), following the roots one by one."% (os.getpid(), i, error))
+            braid = [BraidThread.from_points(thread) for thread in self._follow_strands(e)]
+            ts, positions = self._refined_positions(braid)
+        CC = ComplexField(53)
+        section = lambda k: [CC(x) for x in positions[:len(braid), k]] + self.additional_points
 
-        mtcs = [self.minimal_cover_tree(section) for section in sections]
+        mtc = self.minimal_cover_tree(section(0))
 
         mtcinit = self.minimal_cover_tree(self.system(e[0]) + self.additional_points)
 
-        iso = self.freeGroup.hom(self.xs)
-        if mtcs[0] != mtcinit:
+        # isomorphisms are composed as FreeGroupAutomorphism, and converted back to morphisms of self.freeGroup at the end
+        iso = FreeGroupAutomorphism([(k+1,) for k in range(self.npoints)])
+        if mtc != mtcinit:
             logger.info("[%d] Encountered distinct minimal covering trees between beginning of braid %d and standard configuration."% (os.getpid(), i))
-            iso = self.braid_action(mtcinit, mtcs[0], sections[0])
-
-        for k in range(len(mtcs)-1):
-            mtc1 = mtcs[k]
-            mtcfin = mtcs[k+1]
-            if mtc1!=mtcfin:
-                logger.info("[%d] Encountered distinct minimal covering trees between sections %d and %d (out of %d)."% (os.getpid(), k, k+1, len(mtcs)))
-                iso = self.braid_action(mtc1, mtcfin, sections[k])*iso
-                iso = self.freeGroup.hom([iso(x) for x in self.xs])
-
-        section1 = sections[-1]
+            iso = FreeGroupAutomorphism.from_hom(self.braid_action(mtcinit, mtc, section(0)))
+
+        # the tree is only recomputed at the sections where it is not certified to be unchanged
+        k = 0
+        events = 0
+        while True:
+            k1 = self._next_event(mtc, positions, k)
+            if k1 == None:
+                break
+            events += 1
+            mtcfin = self.minimal_cover_tree(section(k1))
+            if mtc!=mtcfin:
+                logger.info("[%d] Encountered distinct minimal covering trees between sections %d and %d (out of %d)."% (os.getpid(), k1-1, k1, len(ts)))
+                iso = FreeGroupAutomorphism.from_hom(self.braid_action(mtc, mtcfin, section(k1-1)))*iso
+            mtc, k = mtcfin, k1
+        logger.info("[%d] Recomputed minimal covering tree at %d sections out of %d for braid %d."% (os.getpid(), events, len(ts), i))
+
+        section1 = section(len(ts)-1)
         section2 = self.system(e[1]) + self.additional_points
 
-        perm = [Util.select_closest_index(section2,c) for c in section1]+[self.npoints] # this is fine because they are equal (although their presentation might differ)
+        perm = Util.select_closest_indices(section2, section1)+[self.npoints] # this is fine because they are equal (although their presentation might differ)
             
-        mtc1 = mtcs[-1]
+        mtc1 = mtc
         mtcfin = self.minimal_cover_tree(section2)
 
         mtcn = Graph(self.npoints+1)
@@ -309,26 +407,41 @@ class RootsBraid(object):
 
         oe1, oe2 = self.ordered_edges(mtc1), self.ordered_edges(mtcn)
         perm_edge = [oe2.index(self.normalize_edge((perm[e[0]],perm[e[1]]))) for e in oe1]
-        transition_iso = self.freeGroup.hom([self.xs[i] for i in perm_edge])
+        transition_iso = FreeGroupAutomorphism([(i+1,) for i in perm_edge])
         if mtcn!=mtcfin:
             logger.info("[%d] Encountered distinct minimal covering trees between end of braid %d and standard configuration."% (os.getpid(), i))
-            transition_iso = self.braid_action(mtcn, mtcfin, section2)*transition_iso
+            transition_iso = FreeGroupAutomorphism.from_hom(self.braid_action(mtcn, mtcfin, section2))*transition_iso
 
         iso = transition_iso*iso
-        iso = self.freeGroup.hom([iso(x) for x in self.xs])
-        return iso
+        return iso.to_hom(self.freeGroup)
     
     def isomorphism_along_path(self,path):
         """Given a path `path`, computes the braid (as an isomorphism on the fundamental group of the punctured plane) along `path`"""
-        path = [Util.select_closest_index(self.vertices, p)  for p in path]
-        edges = [path[i:i+2] for i in range(len(path)-1)] # TODO try product([self.isomorphism(e) for e in list(reversed(path_edges))])
-        
-        iso = self.isomorphisms(edges[0])
-        for e in edges[1:]:
-            iso = self.isomorphisms(e)*iso
-            iso = self.freeGroup.hom([iso(x) for x in self.xs])
+        path = Util.select_closest_indices(self.vertices, path)
+        return self.native_isomorphism_along_path(tuple(path)).to_hom(self.freeGroup)
+
+    def native_isomorphism_along_path(self, path):
+        """The braid along the path of vertex indices `path`, as a FreeGroupAutomorphism. The braids along all the prefixes of paths are cached, so paths sharing a prefix only compute it once."""
+        if not hasattr(self, '_path_isomorphisms'):
+            self._path_isomorphisms = {}
+        k = len(path)
+        while k>1 and path[:k] not in self._path_isomorphisms:
+            k -= 1
+        iso = self._path_isomorphisms[path[:k]] if k>1 else FreeGroupAutomorphism([(i+1,) for i in range(self.npoints)])
+        for l in range(k, len(path)):
+            iso = self.native_isomorphism(path[l-1:l+1])*iso
+            self._path_isomorphisms[path[:l+1]] = iso
         return iso
 
+    def native_isomorphism(self, e):
+        """The isomorphism of edge e, as a FreeGroupAutomorphism."""
+        if not hasattr(self, '_native_isomorphisms'):
+            self._native_isomorphisms = {}
+        e = tuple(e)
+        if e not in self._native_isomorphisms:
+            self._native_isomorphisms[e] = FreeGroupAutomorphism.from_hom(self.isomorphisms(list(e)))
+        return self._native_isomorphisms[e]
+
     def edge_difference(self, g1, g2):
         """Given two graphs g1, g2, yields the lists `removed_edges, added_edges` such that `removed_edges` is the edges in `g1` and not in `g2`, and `added_edges` the opposite."""
         removed_edges = []
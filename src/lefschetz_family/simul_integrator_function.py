@@ -411,7 +411,17 @@ def _process_path(sys, den, aux, auxden, path, eps, vec=None, ctx=dctx):
     logger.info("done, time=%ss, path = %s", time.time() - t0, path)
     return path
 
-def fundamental_matrices(sys, den, aux, auxden, path, eps, vec=None, ctx=dctx):
+def fundamental_matrices(sys, den, aux, auxden, path, eps, vec=None, ctx=dctx, max_ratio=None):
+    r"""
+    Transition matrix of the system along ``path``.
+
+    If ``max_ratio`` is given, steps whose convergence ratio (length of the
+    step over distance from its start to the nearest singularity of the
+    uncoupled operator) exceeds it are split before any summation is done on
+    them, since the number of terms needed grows like ``prec/log(1/ratio)``
+    and such steps are the ones that fail. By default no step is split ahead
+    of time until one fails to converge.
+    """
 
     z = den.parent().gen()
     logger.info("uncoupling...")
@@ -464,17 +474,37 @@ def fundamental_matrices(sys, den, aux, auxden, path, eps, vec=None, ctx=dctx):
 
     tmat_path = block_matrix([[1, MatrixSpace(Val, aux.nrows(), aux.ncols()).zero()],
                               [0, 1]])
+
+    # The values of transf at the ends of the steps are shared between
+    # adjacent steps, and between a step that failed and its two halves.
+    transf_values = {}
+    def transf_at(z):
+        if z not in transf_values:
+            transf_values[z] = transf(Val(z))
+        return transf_values[z]
+
+    # Largest convergence ratio a step may have before it is worked on, or
+    # None if there is no bound. It starts at max_ratio, and is lowered to the
+    # ratio of any step whose summation fails to converge, so that steps that
+    # are at least as hard are split before doing any work on them instead of
+    # failing again.
+    split_ratio = max_ratio
+
     steps = list(path.steps())
     steps.reverse()
     while steps:
 
         step = steps.pop()
+        ratio = step.cvg_ratio().mid()
+        if split_ratio is not None and ratio > split_ratio:
+            logger.info("splitting step %s ahead of time (convergence ratio %s)", step, ratio)
+            steps.extend(reversed(step.split()))
+            continue
         logger.info("step %s", step)
         t0 = time.time()
         evpts = EvaluationPoint_step([step], jet_order=sys.nrows())
         deltas = [evpts.approx(Val, i) for i in range(len(evpts))]
         z0 = Val(step.start.as_sage_value())
-        z1 = Val(step.end.as_sage_value())
 
         # TODO bornes d'erreur sur la partie aux
         # il faut, en gros :
@@ -499,12 +529,12 @@ def fundamental_matrices(sys, den, aux, auxden, path, eps, vec=None, ctx=dctx):
         try:
             cols = hsm.run()
         except (BoundPrecisionError, PrecisionError):
+            split_ratio = ratio if split_ratio is None else min(split_ratio, ratio)
             steps.extend(reversed(step.split()))
             continue
 
-        # XXX redundant with adjacent steps
-        transf0 = transf(z0)
-        transf1 = transf(z1)
+        transf0 = transf_at(step.start.as_sage_value())
+        transf1 = transf_at(step.end.as_sage_value())
 
         fmats = []
         for m, delta in enumerate(deltas):  # only one iteration for now
@@ -520,6 +550,7 @@ def fundamental_matrices(sys, den, aux, auxden, path, eps, vec=None, ctx=dctx):
         # XXX this is certainly improvable...
         if any(c.rad() > 2.**(-prec0) and c.accuracy() < prec0//2
                for c in vmat_aux.list()):
+            # a loss of accuracy says nothing about convergence, so only this step is split
             steps.extend(reversed(step.split()))
             continue
 
@@ -46,7 +46,7 @@ class Translator(object):
     @property
     def AtoB(self):
         if not hasattr(self, "_AtoB"):
-            self._AtoB = [Util.select_closest_index(self.B.qpoints, p) for p in self.A.qpoints]
+            self._AtoB = Util.select_closest_indices(self.B.qpoints, self.A.qpoints)
         return self._AtoB
 
     
@@ -72,6 +72,12 @@ class Translator(object):
     @property
     def letters(self):
         return self.alphabet.gens()
+
+    @property
+    def letter_indices(self):
+        if not hasattr(self, "_letter_indices"):
+            self._letter_indices = {l:i for i, l in enumerate(self.letters)}
+        return self._letter_indices
     
     @property
     def Bduality(self):
@@ -87,47 +93,83 @@ class Translator(object):
                 delaunay.add_edge(e + [dist])
 
             edgesA = [[self.AtoB[i] for i in e] for e in self.edges_tree]
+            shortest_paths = {} # single source shortest paths, computed once for each source
             paths = []
             for e in edgesA:
-                paths += [delaunay.shortest_path(e[0], e[1], by_weight=True)] 
+                if e[0] not in shortest_paths:
+                    shortest_paths[e[0]] = delaunay.shortest_paths(e[0], by_weight=True)
+                paths += [shortest_paths[e[0]][e[1]]]
+
+            dual_of_edge = {}
+            for e2, d2 in self.B.duality:
+                if tuple(d2) not in dual_of_edge:
+                    dual_of_edge[tuple(d2)] = e2
 
             Bduality = []
             for dA, path in zip(self.edges_tree, paths):
                 for i in range(len(path)-1):
-                    e = path[i:i+2]
-                    for e2,d2 in self.B.duality:
-                        if d2 == e:
-                            Bduality += [[e2, dA]]
-                            break
+                    e = tuple(path[i:i+2])
+                    if e in dual_of_edge:
+                        Bduality += [[dual_of_edge[e], dA]]
             self._Bduality = Bduality
         return self._Bduality
 
+    @property
+    def letter_mapA(self):
+        if not hasattr(self, "_letter_mapA"):
+            self._letter_mapA = self.letter_map(self.A.duality, self.edges_tree)
+        return self._letter_mapA
+
+    @property
+    def letter_mapB(self):
+        if not hasattr(self, "_letter_mapB"):
+            self._letter_mapB = self.letter_map(self.Bduality, self.edges_tree)
+        return self._letter_mapB
+
     def wordA(self, path):
         """Given a path of A, return its word in terms of the tree"""
-        return self.word(path, self.A.duality, self.edges_tree, self.alphabet)
+        return self.word(path, self.A.duality, self.edges_tree, self.alphabet, self.letter_mapA)
     def wordB(self, path):
         """Given a path of B, return its word in terms of the tree"""
-        return self.word(path, self.Bduality, self.edges_tree, self.alphabet)
-    
+        return self.word(path, self.Bduality, self.edges_tree, self.alphabet, self.letter_mapB)
+
+    @staticmethod
+    def letter_map(duality, edges):
+        """Maps each edge crossing an element of `edges`, given as a tuple, to the index of the first such element in `edges`."""
+        indices = {}
+        for k, d in enumerate(edges):
+            if tuple(d) not in indices:
+                indices[tuple(d)] = k
+        letter_map = {}
+        for e, d in duality:
+            k = indices.get(tuple(d))
+            if k != None and (tuple(e) not in letter_map or k < letter_map[tuple(e)]):
+                letter_map[tuple(e)] = k
+        return letter_map
+
     @staticmethod
-    def word(path, duality, edges, alphabet=None):
-        dual_temp = [[e,d] for e,d in duality if d in edges]
-        dual_temp.sort(key=lambda e: edges.index(e[1]))
-        edges_temp = [e for e,_ in dual_temp]
+    def word(path, duality, edges, alphabet=None, letter_map=None):
+        if letter_map==None:
+            letter_map = Translator.letter_map(duality, edges)
         if alphabet==None:
             alphabet = FreeGroup(len(edges))
-        w = alphabet(1)
-        letters = alphabet.gens()
+        letters = [] # the letters of the word, from right to left, in Tietze notation
         for i in range(len(path)-1):
-            e = path[i:i+2]
-            if e in edges_temp:
-                dual = dual_temp[edges_temp.index(e)][1]
-                w = letters[edges.index(dual)]**-1 * w
-            e = list(reversed(e))
-            if e in edges_temp:
-                dual = dual_temp[edges_temp.index(e)][1]
-                w = letters[edges.index(dual)] * w
-        return w
+            e = (path[i], path[i+1])
+            if e in letter_map:
+                letters += [-letter_map[e]-1]
+            e = (path[i+1], path[i])
+            if e in letter_map:
+                letters += [letter_map[e]+1]
+        return alphabet(list(reversed(letters)))
+
+    @staticmethod
+    def words(paths, duality, edges, alphabet=None):
+        """Computes the words of several paths with the same duality."""
+        letter_map = Translator.letter_map(duality, edges)
+        if alphabet==None:
+            alphabet = FreeGroup(len(edges))
+        return [Translator.word(path, duality, edges, alphabet, letter_map) for path in paths]
     
     @property
     def thin_gens(self):
@@ -168,10 +210,10 @@ class Translator(object):
         path = []
         for l, p in list(reversed(w.syllables())):
             assert p in [-1,1]
-            i = self.letters.index(l)
+            i = self.letter_indices[l]
             if p==1:
-                path = path + self.fat_gens[i]
+                path += self.fat_gens[i]
             if p==-1:
-                path = path + list(reversed(self.fat_gens[i]))
+                path += list(reversed(self.fat_gens[i]))
         return Util.simplify_path(path)
         
\ No newline at end of file
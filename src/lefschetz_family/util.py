@@ -26,18 +26,28 @@ from sage.rings.complex_mpfr import ComplexField
 from sage.functions.other import floor
 from sage.arith.misc import gcd
 from sage.arith.misc import xgcd
+from sage.arith.functions import lcm
 from sage.combinat.integer_vector import IntegerVectors
 from sage.matrix.constructor import matrix
 from sage.matrix.special import block_matrix
 from sage.matrix.special import identity_matrix
 from sage.modules.free_module_element import vector
 from sage.rings.integer_ring import ZZ
+from sage.rings.rational_field import QQ
+from sage.rings.infinity import Infinity
+from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+from sage.rings.finite_rings.finite_field_constructor import FiniteField
 
 from sage.misc.prandom import randint, shuffle
 
 from .numperiods.integerRelations import IntegerRelations
+from .numperiods.interpolation import ModularReconstruction
+from .isolatedRoot import RootIsolation
+from .freeGroupAutomorphism import FreeGroupAutomorphism
 
 import logging
+import math
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -78,22 +88,14 @@ class Util(object):
         
         For example, `simplify_path([1,2,3,2,1,4,5,1]) == [1,4,5,1]`
         """
-        i=1
-        res = list(p)
-        while i<len(res)-1:
-            p = res[i-1]
-            a = res[i]
-            n = res[i+1] 
-            if p==a:
-                res = res[:i]+res[i+1:]
-                if i!=1:
-                    i=i-1
-            elif p==n:
-                res = res[:i]+res[i+2:]
-                if i!=1:
-                    i=i-1
-            else:
-                i=i+1
+        res = []
+        for a in p:
+            if len(res)>0 and res[-1]==a:
+                continue
+            if len(res)>1 and res[-2]==a:
+                res.pop()
+                continue
+            res.append(a)
         return res
 
     @staticmethod
@@ -136,6 +138,101 @@ class Util(object):
 
 
 
+    @staticmethod
+    def roots(P, multiplicities=True):
+        """Given a univariate polynomial P with rational or Gaussian rational coefficients, return its complex roots as IsolatedRoot objects, in the same format as P.roots(QQbar)."""
+        res = []
+        for f, m in P.squarefree_decomposition():
+            res += [(r, m) for r in RootIsolation(f).roots]
+        return res if multiplicities else [r for r, _ in res]
+
+    @staticmethod
+    def critical_polynomial(P, fibration, method="groebner"):
+        """Given a homogeneous polynomial P and two linear forms given by their coefficients `fibration`, return a polynomial in t whose roots are the critical values of the pencil of hyperplanes fibration[0]-t*fibration[1].
+
+        With `method="groebner"` the polynomial is obtained by elimination over the rationals.
+        With `method="modular"` the same elimination is carried out modulo several primes and the result is recovered by rational reconstruction.
+        This avoids the growth of the rational coefficients in the Groebner basis, but each prime still costs a full elimination over a finite field.
+        Primes dividing a denominator of P or of `fibration` are skipped.
+        """
+        if method == "groebner":
+            return Util._critical_polynomial_elimination(P, fibration, QQ)
+
+        def ev(prime):
+            return Util._critical_polynomial_elimination(P, fibration, FiniteField(prime)).monic()
+        return PolynomialRing(QQ, 't')(ModularReconstruction(ev).recons())
+
+    @staticmethod
+    def _critical_polynomial_elimination(P, fibration, K):
+        """Computes the critical polynomial of the pencil defined by `fibration` on P with an elimination ideal over the field K.
+        Raises ZeroDivisionError if the characteristic of K divides a denominator of P or of `fibration`."""
+        if K.characteristic() != 0:
+            denominators = [c.denominator() for c in P.coefficients()] + [QQ(c).denominator() for v in fibration[:2] for c in v]
+            if any(d % K.characteristic() == 0 for d in denominators):
+                raise ZeroDivisionError("the characteristic %d divides a denominator of the pencil"% K.characteristic())
+        R = P.parent().change_ring(K)
+        P = R(P)
+        _vars = [v for v in R.gens()]
+        forms=[vector(K, v).dot_product(vector(_vars)) for v in fibration[:2]]
+        f=forms[0]/forms[1]
+        S = PolynomialRing(K, _vars+['k','t'])
+        k,t= S.gens()[-2:]
+        eqs = [
+            P, 
+            forms[1]-1, 
+            t*forms[1]-forms[0]
+        ] + [(f.derivative(var).numerator()*k-P.derivative(var)*f.derivative(var).denominator()) for var in _vars]
+
+        ideal = S.ideal(eqs).elimination_ideal(S.gens()[:-1])
+        Kt = PolynomialRing(K, 't')
+        return Kt(ideal.groebner_basis()[0])
+
+    @staticmethod
+    def recovered_bits(M):
+        """Given a matrix M with ball coefficients, return the number of bits of absolute precision of its least precise coefficient."""
+        rads = [c.rad() for c in M.dense_coefficient_list() if hasattr(c, "rad")]
+        rad = max(rads) if len(rads)>0 else 0
+        if rad == 0:
+            return Infinity
+        return -rad.log2()
+
+    @staticmethod
+    def round_certified(M):
+        """Given a matrix M with complex ball coefficients, return the integer matrix it encloses, or None if some coefficient does not contain a unique integer."""
+        res = []
+        for c in M.list():
+            n = ZZ(c.real().mid().round())
+            if not (c.real().rad() < 1/2 and c.imag().rad() < 1/2 and (c-n).contains_zero()):
+                return None
+            res += [n]
+        return matrix(ZZ, M.nrows(), M.ncols(), res)
+
+    @staticmethod
+    def log2_norm(M):
+        """Given a matrix M with ball coefficients, return an upper bound on the logarithm in base 2 of its infinity norm."""
+        norm = max([sum([abs(c).upper() for c in row]) for row in M.rows()])
+        if norm == 0:
+            return -Infinity
+        return norm.log2()
+
+    @staticmethod
+    def predicted_steps(e, singularities, ratio=0.5):
+        """Given a segment e=[z0, z1] and a list of singular points, estimate the number of steps of analytic continuation along e, 
+        assuming each step covers `ratio` times the distance to the closest singularity."""
+        CC=ComplexField(53)
+        z0, z1 = CC(e[0]), CC(e[1])
+        length = float(abs(z1-z0))
+        if length == 0:
+            return 0
+        u = (z1-z0)/length
+        # position of each singularity in coordinates where the segment is [0, length] on the real axis
+        ws = [(CC(p)-z0)/u for p in singularities]
+        distance = lambda w: float(abs(w.imag())) if 0<=w.real()<=length else float(min(abs(w), abs(w-length)))
+        w = min(ws, key=distance)
+        s, delta = float(w.real()), max(float(abs(w.imag())), length*2**-40)
+        # integral of 1/|z-p| along the segment
+        return (math.asinh((length-s)/delta) + math.asinh(s/delta))/ratio
+
     @staticmethod
     def select_closest(l, e):
         """Given a list of complex numbers l and a complex number e, return the element e2 of l minimizing abs(e2-e)"""
@@ -176,6 +273,45 @@ class Util(object):
         
         return CC(M.determinant())<0
 
+    @staticmethod
+    def select_closest_indices(l, es, tol=1e-10):
+        """Given a list of complex numbers l and a list of complex numbers es, return the list of indices minimizing abs(l[i]-e) for e in es.
+        Distances are computed in double precision, and select_closest_index is only called when the closest element is ambiguous at that precision."""
+        CC=ComplexField(53)
+        if len(l) < 2:
+            return [0]*len(es)
+        points = np.array([complex(CC(v)) for v in l])
+        queries = np.array([complex(CC(e)) for e in es])
+        scale = np.max(np.abs(points))
+        res = []
+        for start in range(0, len(queries), 256): # chunks bound the size of the distance matrix
+            distances = np.abs(queries[start:start+256, None] - points[None, :])
+            closest = np.argsort(distances, axis=1, kind="stable")[:, :2]
+            for k, (i, j) in enumerate(closest):
+                d1, d2 = distances[k, i], distances[k, j]
+                if d2 - d1 <= tol*(scale + abs(queries[start+k])):
+                    res += [Util.select_closest_index(l, es[start+k])]
+                else:
+                    res += [int(i)]
+        return res
+
+    @staticmethod
+    def are_clockwise(ls, tol=1e-10):
+        """Given a list of lists of complex numbers describing convex polygons, return for each of them whether the points are clockwise.
+        The signed areas are computed in double precision, and is_clockwise is only called when the sign is ambiguous at that precision."""
+        CC=ComplexField(53)
+        res = []
+        for l in ls:
+            polygon = np.array([complex(CC(v)) for v in l])
+            nxt = np.roll(polygon, -1)
+            area = np.sum(polygon.real*nxt.imag - nxt.real*polygon.imag)
+            scale = np.max(np.abs(polygon - polygon.mean()))
+            if abs(area) <= tol*len(l)*scale**2:
+                res += [Util.is_clockwise(l)]
+            else:
+                res += [bool(area < 0)]
+        return res
+
     @staticmethod
     def is_simple(l):
         """Given a list of words l, return whether every word in the list consists of a single letter."""
@@ -251,6 +387,11 @@ class Util(object):
     def invert_morphism(phi):
         """Given an invertible free group morphism phi, computes its inverse. 
         Optionally, you can give generators ts of a subgroup (as a list of words) to compute the inverse of the restriction of phi on \\langle ts \\rangle (assuming it is invertible)."""
+        if phi.domain().ngens() == phi.codomain().ngens():
+            # Nielsen reduction of the images usually succeeds, and is much faster
+            inverse = FreeGroupAutomorphism.from_hom(phi).inverse()
+            if inverse != None:
+                return inverse.to_hom(phi.codomain(), phi.domain())
         singlets = []
         ts = Util.easy_simplifications(phi)
         xs = list(phi.codomain().gens())
@@ -290,6 +431,36 @@ class Util(object):
         return  phi.codomain().hom(tfin)
 
 
+    @staticmethod
+    def transvection(M):
+        """Given an integer matrix M, returns a primitive integer vector v and an integer vector w such that M-1 is the outer product of v and w, or None if M-1 does not have rank 1."""
+        N = M-1
+        columns = [j for j in range(N.ncols()) if not N.column(j).is_zero()]
+        if len(columns)==0:
+            return None
+        c = N.column(columns[0])
+        v = c/gcd(c.list())
+        i0 = [i for i in range(len(v)) if v[i]!=0][0]
+        w = [N[i0,j]/v[i0] for j in range(N.ncols())]
+        if not all([wj in ZZ for wj in w]):
+            return None
+        v, w = vector(ZZ, v), vector(ZZ, w)
+        if v.column()*w.row() != N:
+            return None
+        return v, w
+
+    @staticmethod
+    def bezout_vector(w):
+        """Given an integer vector w, returns an integer vector p such that w*p = gcd(w)."""
+        g, p = 0, [0]*len(w)
+        for j, wj in enumerate(w):
+            if wj == 0:
+                continue
+            g, a, b = xgcd(g, wj)
+            p = [a*x for x in p]
+            p[j] = b
+        return vector(ZZ, p)
+
     @staticmethod
     def find_complement( B, primitive=True):
         """Given an m x n integer valued matrix B with n>m, computes an (n-m) x n matrix A such that the matrix block_matrix([[A],[B]]) is invertible over the integers"""
@@ -309,6 +480,15 @@ class Util(object):
             conj = conj*l**p
         return conj
     
+    @staticmethod
+    def index_of(x, l):
+        """Returns the index of the first element of l equal to x, or None if there is none.
+        The elements of l are on the left of the comparison, so that lightweight numbers such as IsolatedRoot decide equality themselves, whatever x is."""
+        for i, e in enumerate(l):
+            if e == x:
+                return i
+        return None
+
     @staticmethod
     def remove_duplicates(l):
         l2 = []
@@ -330,19 +510,44 @@ class Util(object):
 
     @staticmethod
     def saturate(Ms):
+        """Given a list of matrices Ms, returns a basis (as columns) of the smallest lattice containing ZZ^n that is stable under the action of Ms."""
         dim = Ms[0].nrows()
+        # B is a basis of the lattice spanned so far, and only the newly added vectors are queued
+        B = identity_matrix(QQ, dim)
+        Binv = identity_matrix(QQ, dim)
+        queue = identity_matrix(QQ, dim).rows()
+        while len(queue)>0:
+            v = queue.pop()
+            for M in Ms:
+                w = M*v
+                c = w*Binv
+                if c.denominator() == 1:
+                    continue
+                while c.denominator() != 1:
+                    B, Binv = Util._extend_basis(B, Binv, c)
+                    c = w*Binv
+                queue += [w]
         span = identity_matrix(dim).image()
-        fam = identity_matrix(dim).rows()
-        new = True
-        while new:
-            new=False
-            for v in span.span(fam).basis():
-                for M in Ms:
-                    if M*v not in span.span(fam):
-                        new = True
-                        fam += [M*v]
-        CB = span.span(fam).basis_matrix().transpose()
+        CB = span.span(B.rows()).basis_matrix().transpose()
         return CB
+
+    @staticmethod
+    def _extend_basis(B, Binv, c):
+        """Given a basis B (as rows) of a lattice, its inverse Binv and the coordinates c in this basis of a vector w, returns a basis of a larger lattice contained in the lattice spanned by B and w, and its inverse.
+        The denominator of the coordinates of w is divided by the largest power of its smallest prime factor. Only one row of B is replaced, so that Binv is updated by a rank one correction."""
+        d = c.denominator()
+        p = d.prime_factors()[0]
+        q = p**d.valuation(p)
+        cq = (d/q)*c
+        # some coordinate of cq has denominator q, and this row can be replaced by a combination with coefficient 1/q
+        k = [j for j in range(len(cq)) if cq[j].denominator() == q][0]
+        u = ZZ(cq[k].numerator()).inverse_mod(q)
+        cs = vector(QQ, [u*x - (u*x).round() for x in cq])
+        cs[k] = QQ(1)/q
+        ek = vector(QQ, [1 if j == k else 0 for j in range(len(c))])
+        B = B + ek.column()*(cs*B - B.row(k)).row()
+        Binv = Binv - q*Binv.column(k).column()*(cs - ek).row()
+        return B, Binv
     
     @staticmethod
     def check_if_algebraic(c, order=10):
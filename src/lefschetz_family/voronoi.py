@@ -22,6 +22,7 @@ except ImportError:
     import sage.all__sagemath_modules
 
 from sage.rings.rational_field import QQ
+from sage.rings.rational import Rational
 from sage.rings.complex_mpfr import ComplexField
 from sage.graphs.graph import Graph
 from sage.rings.imaginary_unit import I
@@ -33,24 +34,36 @@ from sage.misc.flatten import flatten
 from sage.graphs.spanning_tree import boruvka
 
 import os
+import logging
+import numpy as np
 
 from .util import Util
+from .floatVoronoi import FloatVoronoiDiagram
 from .pointed_loops import PointedLoop
 
+logger = logging.getLogger(__name__)
+
 class FundamentalGroupVoronoi(object):
-    def __init__(self, points, basepoint, border=5):
+    def __init__(self, points, basepoint, border=5, exact=False, weight="length"):
         """FundamentalGroupVoronoi(points, basepoint)
+
+        If `exact` is False, the Voronoi diagram is computed in double precision, and exactly only if the result cannot be trusted.
+        The spanning tree and the loops are chosen to minimize either the length of the edges (`weight="length"`)
+        or the predicted number of steps of numerical integration along them (`weight="cost"`).
         """
         assert basepoint not in points
+        assert weight in ["length", "cost"], "unknown weight"
 
         self._points = [basepoint] + points
         self._border = border
+        self._exact = exact
+        self._weight = weight
 
         self.CC = ComplexField(50) # ultimately this should be dropped for certified precision
 
 
     def rationalize(self, z):
-        if z.parent()==QQ:
+        if isinstance(z, Rational):
             return z
         zcc = self.CC(z)
         zr, zi = zcc.real(), zcc.imag()
@@ -65,8 +78,15 @@ class FundamentalGroupVoronoi(object):
     @property
     def prec(self):
         if not hasattr(self, "_prec"):
-            points_differences = flatten([[self.CC(self._points[i]) - self.CC(self._points[j]) for j in range(i)] for i in range(len(self._points))])
-            self._prec = Util.simple_rational(min([abs(p) for p in points_differences]), min([abs(p) for p in points_differences])/100)/100
+            points = [self.CC(p) for p in self._points]
+            # the closest point to any point is one of its neighbours in the Delaunay triangulation
+            neighbours = list(FloatVoronoiDiagram([(z.real(), z.imag()) for z in points]).dual_edges)
+            if len(neighbours) == 0:
+                # the points could not be triangulated, e.g. because they are collinear, in which case the closest point to any point is next to it in lexicographic order
+                order = sorted(range(len(points)), key=lambda i: (points[i].real(), points[i].imag()))
+                neighbours = list(zip(order[:-1], order[1:]))
+            distance = min([abs(points[i] - points[j]) for i, j in neighbours])
+            self._prec = Util.simple_rational(distance, distance/100)/100
         return self._prec
     
     @property
@@ -88,9 +108,12 @@ class FundamentalGroupVoronoi(object):
         """
         if not hasattr(self, "_edges"):
             edges = []
+            seen = set()
             for center, polygon in self.polygons:
                 for e in polygon:
-                    if e not in edges and [e[1], e[0]] not in edges:
+                    if (e[0], e[1]) not in seen:
+                        seen.add((e[0], e[1]))
+                        seen.add((e[1], e[0]))
                         edges += [e]
                 if center == self.qpoints[0]:
                     connection_to_basepoint = min([i for i in flatten(polygon)], key=lambda i: abs(self.vertices[0] - self.vertices[i]))
@@ -103,6 +126,10 @@ class FundamentalGroupVoronoi(object):
     def border(self):
         return self._border
 
+    @property
+    def weight(self):
+        return self._weight
+
     @property
     def qpoints(self):
         if not hasattr(self, "_qpoints"):
@@ -113,9 +140,15 @@ class FundamentalGroupVoronoi(object):
     def duality(self):
         if not hasattr(self, "_duality"):
             duality= [[] for e in self.edges]
+            # cells that were updated separately may list a shared edge in opposite orientations
+            edge_indices = {}
+            for i, e in enumerate(self.edges):
+                edge_indices[(e[0], e[1])] = i
+                edge_indices[(e[1], e[0])] = i
+            point_indices = {self.complex_number_to_point(q):i for i, q in enumerate(self.qpoints)}
             for c, pol in self.polygons:
                 for e in pol:
-                    duality[self.edges.index(e)] += [Util.select_closest_index(self.points, c)]
+                    duality[edge_indices[tuple(e)]] += [point_indices[self.complex_number_to_point(c)]]
             duality = [[self.edges[i], d] for i, d in enumerate(duality) if len(d)==2]
             for i,du in enumerate(duality):
                 e,d = du
@@ -132,9 +165,27 @@ class FundamentalGroupVoronoi(object):
     @property
     def graph(self):
         if not hasattr(self, "_graph"):
-            self._graph = Graph([(e[0], e[1], self.rationalize(abs(self.vertices[e[0]] - self.vertices[e[1]]))) for e in self.edges])
+            if self._weight == "cost":
+                self._graph = Graph([(e[0], e[1], c) for e, c in zip(self.edges, self.predicted_costs)])
+            else:
+                self._graph = Graph([(e[0], e[1], self.rationalize(abs(self.vertices[e[0]] - self.vertices[e[1]]))) for e in self.edges])
         return self._graph
 
+    @property
+    def predicted_costs(self):
+        """The predicted number of steps of numerical integration along each edge of self.edges."""
+        if not hasattr(self, "_predicted_costs"):
+            # the closest singularities to a Voronoi edge are the two points whose cells it separates
+            dual_points = {tuple(e):[self.qpoints[k] for k in d if k!=0] for e, d in self.duality}
+            costs = []
+            for e in self.edges:
+                singularities = dual_points.get(tuple(e), [])
+                if len(singularities) == 0:
+                    singularities = self.qpoints[1:]
+                costs += [Util.predicted_steps([self.vertices[e[0]], self.vertices[e[1]]], singularities)]
+            self._predicted_costs = costs
+        return self._predicted_costs
+
     @property
     def tree(self):
         if not hasattr(self, "_tree"):
@@ -142,12 +193,43 @@ class FundamentalGroupVoronoi(object):
             self._tree = Graph(tree_edges)
         return self._tree
 
+    @property
+    def tree_parents(self):
+        """The parent of each vertex in self.tree, rooted at the basepoint."""
+        if not hasattr(self, "_tree_parents"):
+            self._compute_tree_structure()
+        return self._tree_parents
+
+    @property
+    def tree_depths(self):
+        """The weighted distance in self.tree from each vertex to the basepoint."""
+        if not hasattr(self, "_tree_depths"):
+            self._compute_tree_structure()
+        return self._tree_depths
+
+    def _compute_tree_structure(self):
+        parents = {0:None}
+        depths = {0:0}
+        queue = [0]
+        k = 0
+        while k < len(queue):
+            v = queue[k]
+            k += 1
+            for u, w, label in self.tree.edges_incident(v):
+                child = w if u == v else u
+                if child not in parents:
+                    parents[child] = v
+                    depths[child] = depths[v] + label
+                    queue += [child]
+        self._tree_parents = parents
+        self._tree_depths = depths
+
     @property
     def loop_points(self):
         if not hasattr(self, "_loop_points"):
             loop_points = []
             for i, loop in enumerate(self.loops):
-                loop_point = min(loop[1:], key=lambda v:self.tree.distance(v,0, by_weight=True))
+                loop_point = min(loop[1:], key=lambda v:self.tree_depths[v])
                 index = loop.index(loop_point)
                 if index!=0:
                     loop = loop[index:-1] + loop[:index] + [loop[index]]
@@ -159,7 +241,13 @@ class FundamentalGroupVoronoi(object):
     @property
     def paths(self):
         if not hasattr(self, "_paths"):
-            self._paths = [self.tree.all_paths(0, v)[0] for v in self.loop_points]
+            paths = []
+            for v in self.loop_points:
+                path = [v]
+                while path[-1] != 0:
+                    path += [self.tree_parents[path[-1]]]
+                paths += [list(reversed(path))]
+            self._paths = paths
         return self._paths
     
     @property
@@ -169,7 +257,8 @@ class FundamentalGroupVoronoi(object):
             for i in range(len(self.points)-1):
                 pointed_loops += [PointedLoop(self.paths[i][:-1] + self.loops[i] + list(reversed(self.paths[i][:-1])))]
             self._pointed_loops = pointed_loops
-            del self._voronoi_diagram # this is to allow saving; save pickle
+            if hasattr(self, "_voronoi_diagram"):
+                del self._voronoi_diagram # this is to allow saving; save pickle
         return self._pointed_loops
     
     @property
@@ -184,6 +273,7 @@ class FundamentalGroupVoronoi(object):
     def loops(self):
         if not hasattr(self, "_loops"):
             loops = []
+            polygons = []
             for center, polygon in self.polygons:
                 if center == self.vertices[0]:
                     continue
@@ -202,7 +292,10 @@ class FundamentalGroupVoronoi(object):
                         polygon.pop(i)
                         break
 
-                loops += [list(reversed(loop))] if Util.is_clockwise([self.vertices[i] for i in loop[:-1]]) else [loop]
+                polygons += [loop]
+            clockwise = Util.are_clockwise([[self.vertices[i] for i in loop[:-1]] for loop in polygons])
+            for loop, c in zip(polygons, clockwise):
+                loops += [list(reversed(loop))] if c else [loop]
             self._loops = loops
         return self._loops
 
@@ -210,19 +303,180 @@ class FundamentalGroupVoronoi(object):
     def minimal_tree(self):
         if not hasattr(self, "_minimal_tree"):
             edges = []
+            seen = set()
             for path in self.paths:
                 for i in range(len(path)-1):
                     e0 = path[i]
                     e1 = path[i+1]
-                    if [e0,e1] not in edges and [e1,e0] not in edges:
+                    if (e0, e1) not in seen:
+                        seen.add((e0, e1))
+                        seen.add((e1, e0))
                         edges+=[[e0, e1]]
             self._minimal_tree = Graph(edges)
         return self._minimal_tree
 
-    def neighbours(self, v): # maybe this shoudl be done only once?
-        neighbours = self.graph.neighbors(v)
-        neighbours.sort(key=lambda v2:arg(self.vertices[v2] - self.vertices[v]))
-        return neighbours
+    def neighbours(self, v):
+        """The neighbours of v in self.graph, sorted by argument around v."""
+        if not hasattr(self, "_neighbours"):
+            self._neighbours = {}
+        if v not in self._neighbours:
+            neighbours = self.graph.neighbors(v)
+            neighbours.sort(key=lambda v2:arg(self.vertices[v2] - self.vertices[v]))
+            self._neighbours[v] = neighbours
+        return list(self._neighbours[v])
+
+    def updated(self, added=None, removed=None):
+        """Returns the path structure obtained by inserting the points `added` and removing the points `removed`, together with the list of its edges that are not edges of self.
+
+        The rational approximations of the points are kept whenever the new configuration allows it.
+        If the diagram of self was computed in double precision and the added points lie within the points of self,
+        only the cells of the points whose neighbours change are computed again, and the other cells, and therefore their edges, are kept as they are.
+        Otherwise the diagram is computed from scratch.
+        Integration results along the unchanged edges can then be reused, see `Integrator.edge_matrices`.
+        """
+        added = [] if added == None else added
+        removed = [] if removed == None else removed
+        self.polygons
+        sites = self._site_points
+        kept = list(range(1, len(sites)))
+        for p in removed:
+            i = Util.index_of(p, sites[1:])
+            assert i != None, "some removed points are not points of the path structure"
+            kept.remove(i+1)
+        fg = FundamentalGroupVoronoi([sites[i] for i in kept] + added, sites[0], border=self.border, exact=self._exact, weight=self._weight)
+        if fg.prec >= self.prec:
+            fg._prec = self.prec
+            fg._qpoints = [self._rootapprox[0]] + [self._rootapprox[i] for i in kept] + [fg.rationalize(p) for p in added]
+            if hasattr(self, "_site_neighbours") and self._update_cells(fg, kept):
+                logger.info("Updated %d cells of the Voronoi diagram out of %d"% (len(fg._updated_cells), len(fg.qpoints)))
+
+        old_edges = set()
+        for e in self.edges:
+            z0, z1 = [self.complex_number_to_point(self.vertices[v]) for v in e]
+            old_edges.add((z0, z1))
+            old_edges.add((z1, z0))
+        changed_edges = [e for e in fg.edges if tuple([fg.complex_number_to_point(fg.vertices[v]) for v in e]) not in old_edges]
+        logger.info("Updated path structure has %d new edges out of %d"% (len(changed_edges), len(fg.edges)))
+        return fg, changed_edges
+
+    def _update_cells(self, fg, kept):
+        """Sets the Voronoi cells of `fg`, whose points are the basepoint, the points of self of indices `kept` and new points, from those of self.
+        Only the cells that change are computed again, from the Voronoi diagram of the sites around them.
+        Returns False, leaving the cells of `fg` to be computed from scratch, if this cannot be done reliably.
+        """
+        tol = float(self.prec)
+        nsites, npoints, nborder = len(self._site_points), len(fg.qpoints), len(self.border_points)
+        added = list(range(len(kept)+1, npoints))
+        removed = set(range(1, nsites)).difference(kept)
+
+        # the border points of self still bound the cells if the new points lie within the points of self
+        added_coordinates = np.array([[float(c) for c in fg.complex_number_to_point(fg.qpoints[j])] for j in added]).reshape(-1, 2)
+        xmin, xmax, ymin, ymax = [float(c) for c in self._box]
+        if not all([xmin <= x <= xmax and ymin <= y <= ymax for x, y in added_coordinates]):
+            return False
+
+        # sites are indexed as in self._rootapprox, that is the points first and then the border points
+        old_index = [0] + kept + [None]*len(added) + list(range(nsites, nsites + nborder))
+        new_index = {i:j for j, i in enumerate(old_index) if i != None}
+        coordinates = np.concatenate([self._site_coordinates[old_index[:len(kept)+1]], added_coordinates, self._site_coordinates[nsites:]])
+
+        # the neighbours of the removed points change, as do the points whose cells have a vertex closer to an added point
+        affected = set()
+        for i in removed:
+            affected.update(self._site_neighbours[i])
+        if len(added) > 0:
+            owners = [i for i in range(nsites) if i not in removed for v in self._cell_coordinates[i]]
+            corners = np.concatenate([self._cell_coordinates[i] for i in range(nsites) if i not in removed])
+            distances = np.linalg.norm(corners - self._site_coordinates[owners], axis=1)
+            for a in added_coordinates:
+                closer = np.linalg.norm(corners - a, axis=1) < distances + tol
+                affected.update([owners[k] for k in np.flatnonzero(closer)])
+        affected = set([new_index[i] for i in affected.difference(removed)] + added)
+        if 2*len(affected) > npoints:
+            return False
+
+        local = set(affected)
+        for j in affected:
+            if j not in added:
+                local.update([new_index[i] for i in self._site_neighbours[old_index[j]] if i not in removed])
+        local = sorted(local)
+        position = {j:k for k, j in enumerate(local)}
+        fvd = FloatVoronoiDiagram(coordinates[local])
+        regions = fvd.regions(tol) if len(local) > 0 else ([], [], [])
+        if regions == None:
+            return False
+        fvertices, cells, _ = regions
+        fvertices = np.array(fvertices).reshape(-1, 2)
+
+        # the new cells are only correct if their vertices are not closer to any other point
+        targets = [j for j in sorted(affected) if j < npoints]
+        target_corners = {}
+        for j in targets:
+            if not FloatVoronoiDiagram._is_cycle(cells[position[j]]):
+                return False
+            target_corners[j] = sorted(set(flatten(cells[position[j]])))
+            corners = fvertices[target_corners[j]]
+            distances = np.linalg.norm(corners[:,None,:] - coordinates[None,:,:], axis=2)
+            if np.any(distances.min(axis=1) < distances[:,j] - tol):
+                return False
+
+        # vertices shared with cells that are kept are taken from these cells
+        kept_corners = [z for j in local if j < npoints and j not in affected for z in self._cell_corners[old_index[j]]]
+        kept_coordinates = np.concatenate([self._cell_coordinates[old_index[j]] for j in local if j < npoints and j not in affected] + [np.zeros((0, 2))])
+        rvertices = {}
+        for j in targets:
+            for v in target_corners[j]:
+                if v in rvertices:
+                    continue
+                if len(kept_corners) > 0:
+                    distances = np.linalg.norm(kept_coordinates - fvertices[v], axis=1)
+                    k = int(np.argmin(distances))
+                    if distances[k] <= tol:
+                        rvertices[v] = kept_corners[k]
+                        continue
+                rvertices[v] = fg.rationalize(fg.CC(*fvertices[v]))
+
+        site_cells, cell_corners, cell_coordinates = [], [], []
+        for j in range(npoints):
+            if j in affected:
+                site_cells += [[fg.qpoints[j], [[rvertices[e[0]], rvertices[e[1]]] for e in cells[position[j]]]]]
+                cell_corners += [[rvertices[v] for v in target_corners[j]]]
+                cell_coordinates += [fvertices[target_corners[j]]]
+            else:
+                site_cells += [[fg.qpoints[j], self._site_cells[old_index[j]][1]]]
+                cell_corners += [self._cell_corners[old_index[j]]]
+                cell_coordinates += [self._cell_coordinates[old_index[j]]]
+
+        # removing points only creates edges between their neighbours, and adding points only removes edges from the points whose cells change
+        local_neighbours = {j:set() for j in affected}
+        for a, b in fvd.dual_edges:
+            a, b = local[a], local[b]
+            if a in affected:
+                local_neighbours[a].add(b)
+            if b in affected:
+                local_neighbours[b].add(a)
+        site_neighbours = []
+        for j in range(npoints + nborder):
+            if j in affected:
+                site_neighbours += [local_neighbours[j]]
+                continue
+            neighbours = [new_index[i] for i in self._site_neighbours[old_index[j]] if i not in removed]
+            site_neighbours += [set([k for k in neighbours if k not in affected or j in local_neighbours[k]])]
+        for j in affected:
+            for k in local_neighbours[j]:
+                site_neighbours[k].add(j)
+
+        fg._box = self._box
+        fg._border_points = self.border_points
+        fg._site_points = list(fg.points)
+        fg._rootapprox = fg.qpoints + self.border_points
+        fg._site_coordinates = coordinates
+        fg._site_neighbours = site_neighbours
+        fg._site_cells = site_cells
+        fg._cell_corners = cell_corners
+        fg._cell_coordinates = cell_coordinates
+        fg._updated_cells = targets
+        return True
 
     def sort_loops(self):
         order = self._sort_loops_rec(0)
@@ -237,9 +491,7 @@ class FundamentalGroupVoronoi(object):
     def adapted_loops(self, subvoronoi):
         for v in subvoronoi.points:
             assert v in self.points
-        correspondance = []
-        for v in subvoronoi.vertices:
-            correspondance += [Util.select_closest_index(self.vertices,v)]
+        correspondance = Util.select_closest_indices(self.vertices, subvoronoi.vertices)
         adapted_loops = []
         for loop in subvoronoi.pointed_loops:
             adapted_loop = [correspondance[loop[0]]]
@@ -250,88 +502,152 @@ class FundamentalGroupVoronoi(object):
 
 
     def _sort_loops_rec(self, v, parent=None, depth=0):
-        neighbours = self.neighbours(v)
-        tree_neighbours = self.minimal_tree.neighbors(v)
-        loops = [(i, loop[1]) for i, loop in enumerate(self.loops) if loop[0]==v]
-        if parent!=None:
-            index = neighbours.index(parent)
-            neighbours = neighbours[index:] + neighbours[:index]
+        """Orders the loops by a depth first traversal of the minimal tree from v, turning around each vertex starting from the edge towards its parent."""
+        # the minimal tree is computed first, as this rotates each loop to start at its loop point
+        tree_neighbours = {u:set(self.minimal_tree.neighbors(u)) for u in self.minimal_tree.vertices(sort=False)}
+        loops_at = {}
+        for i, loop in enumerate(self.loops):
+            loops_at[(loop[0], loop[1])] = loops_at.get((loop[0], loop[1]), []) + [i]
+
+        def rotated_neighbours(v, parent):
+            neighbours = self.neighbours(v)
+            if parent!=None:
+                index = neighbours.index(parent)
+                neighbours = neighbours[index:] + neighbours[:index]
+            return neighbours
 
         order = []
-        for child in neighbours:
-            if child!= parent and child in tree_neighbours:
-                order+=self._sort_loops_rec(child, v, depth+1)
-            for loop in loops:
-                if loop[1] == child:
-                    order+=[loop[0]]
+        # each frame is [vertex, parent, neighbours, index of the current neighbour, whether its subtree was already traversed]
+        stack = [[v, parent, rotated_neighbours(v, parent), 0, False]]
+        while len(stack)>0:
+            frame = stack[-1]
+            v, parent, neighbours, k, descended = frame
+            if k == len(neighbours):
+                stack.pop()
+                continue
+            child = neighbours[k]
+            if not descended and child!= parent and child in tree_neighbours.get(v, set()):
+                frame[4] = True
+                stack += [[child, v, rotated_neighbours(child, v), 0, False]]
+                continue
+            order += loops_at.get((v, child), [])
+            frame[3] += 1
+            frame[4] = False
         return order
 
 
     @property
-    def polygons(self): # this interfacing with VoronoiDiagram is so ugly
-        if not hasattr(self, "_polygons"):
-            vertices = [self.qpoints[0]]
-            rootapprox = [p for p in self.qpoints] # there should be a `copy` function
-
+    def border_points(self):
+        """Points on a rectangle around self.qpoints, added to the sites of the Voronoi diagram so that the cells of the points are bounded."""
+        if not hasattr(self, "_border_points"):
             qpoints = [self.complex_number_to_point(z) for z in self.qpoints]
             reals = [s[0] for s in qpoints]
             imags = [s[1] for s in qpoints]
             xmin, xmax, ymin, ymax = min(reals), max(reals), min(imags), max(imags)
+            self._box = (xmin, xmax, ymin, ymax)
             shift = max(ymax-ymin, xmax-xmin)/2 # there is likely something more clever to do here
             xmin, xmax, ymin, ymax = xmin - shift, xmax + shift, ymin - shift, ymax + shift
-            
+
+            border_points = []
             for i in range(self.border):
                 step = QQ(i)/QQ(self.border)
-                rootapprox += [xmin + step*(xmax-xmin) + I*ymax]
-                rootapprox += [xmax + step*(xmin-xmax) + I*ymin]
-                rootapprox += [xmin + I*(ymin + step*(ymax-ymin))]
-                rootapprox += [xmax + I*(ymax + step*(ymin-ymax))]
-            
-            list_of_rational_points = [] # why is this necessary? I do not know, but otherwise VoronoiDiagram throws a fit
-            for z in rootapprox:
-                p = self.complex_number_to_point(z)
-                list_of_rational_points+= [[QQ(p[0]), QQ([p[1]])]]
-
+                border_points += [xmin + step*(xmax-xmin) + I*ymax]
+                border_points += [xmax + step*(xmin-xmax) + I*ymin]
+                border_points += [xmin + I*(ymin + step*(ymax-ymin))]
+                border_points += [xmax + I*(ymax + step*(ymin-ymax))]
+            self._border_points = border_points
+        return self._border_points
+
+    def _compute_cells(self):
+        """Computes the Voronoi cell of each point of self.qpoints, given by its edges as pairs of rational complex numbers.
+        When the diagram is computed in double precision, the vertices of each cell and the neighbours of each site are also kept, so that the cells can be updated locally, see `updated`.
+        """
+        rootapprox = [p for p in self.qpoints] + self.border_points # there should be a `copy` function
+        
+        list_of_rational_points = [] # why is this necessary? I do not know, but otherwise VoronoiDiagram throws a fit
+        for z in rootapprox:
+            p = self.complex_number_to_point(z)
+            list_of_rational_points+= [[QQ(p[0]), QQ([p[1]])]]
+
+        self._site_points = list(self.points)
+        self._rootapprox = rootapprox
+
+        # we are only interested in cells around elements of self.points, which come first in rootapprox
+        polygons_temp = None
+        if not self._exact:
+            fvd = FloatVoronoiDiagram(list_of_rational_points)
+            regions = fvd.regions(float(self.prec))
+            if regions != None:
+                fvertices, cells, _ = regions
+                rvertices = {}
+                cell_corners, cell_coordinates = [], []
+                for i in range(len(self.qpoints)):
+                    corners = sorted(set(flatten(cells[i])))
+                    for v in corners:
+                        if v not in rvertices:
+                            rvertices[v] = self.rationalize(self.CC(*fvertices[v]))
+                    cell_corners += [[rvertices[v] for v in corners]]
+                    cell_coordinates += [np.array([fvertices[v] for v in corners]).reshape(-1, 2)]
+                polygons_temp = [[c, [[rvertices[e[0]], rvertices[e[1]]] for e in cells[i]]] for i, c in enumerate(self.qpoints)]
+
+                site_neighbours = [set() for z in rootapprox]
+                for i, j in fvd.dual_edges:
+                    site_neighbours[i].add(j)
+                    site_neighbours[j].add(i)
+                self._site_coordinates = np.array(fvd.points)
+                self._site_neighbours = site_neighbours
+                self._cell_corners = cell_corners
+                self._cell_coordinates = cell_coordinates
+            else:
+                logger.info("Falling back to exact computation of the Voronoi diagram")
+
+        if polygons_temp == None:
             vd = VoronoiDiagram(list_of_rational_points)
-
             self._voronoi_diagram = vd
-            self._rootapprox = rootapprox
 
-            polygons_temp = [] # first we collect all polygons and translate the centers in rational coordinates
+            # the sites of the diagram are exactly the rational points given as input, so cells are matched to their centers by hashing coordinates
+            regions = {}
             for pt, reg in vd.regions().items():
-                center = Util.select_closest(rootapprox, self.rationalize(self.point_to_complex_number(pt.affine())))
-                
-                polygons_temp += [[center, reg]]
+                regions[tuple(QQ(c) for c in pt.affine())] = reg
+
+            polygons_temp = []
+            for c in self.qpoints:
+                polygon = regions[self.complex_number_to_point(c)]
+                polygons_temp += [[c, [[self.rationalize(self.point_to_complex_number(v)) for v in edge] for edge in polygon.bounded_edges()]]]
+
+        self._site_cells = polygons_temp
 
-            # we are only interested in cells around elements of self.points
-            indices = [Util.select_closest_index([center for center, polygon in polygons_temp], c) for c in self.qpoints]
-            polygons_temp = [polygons_temp[i] for i in indices]
+    @property
+    def polygons(self): # this interfacing with VoronoiDiagram is so ugly
+        if not hasattr(self, "_polygons"):
+            if not hasattr(self, "_site_cells"):
+                self._compute_cells()
+            polygons_temp = self._site_cells
+            vertices = [polygons_temp[0][0]]
 
-            # then we translate the edges in rational coordinate as well
+            # then we index the vertices
+            vertex_indices = {self.complex_number_to_point(vertices[0]):0}
             polygons = []
             for center, polygon in polygons_temp:
                 edges = []
-                for edge in polygon.bounded_edges():
-                    e0 = self.rationalize(self.point_to_complex_number(edge[0]))
-                    if e0 not in vertices:
-                        vertices += [e0]
-                    e1 = self.rationalize(self.point_to_complex_number(edge[1]))
-                    if e1 not in vertices:
-                        vertices += [e1]
-                    if e0 != e1:
-                        edges += [[vertices.index(e0),vertices.index(e1)]]
+                for edge in polygon:
+                    indices = []
+                    for z in edge:
+                        key = self.complex_number_to_point(z)
+                        if key not in vertex_indices:
+                            vertex_indices[key] = len(vertices)
+                            vertices += [z]
+                        indices += [vertex_indices[key]]
+                    if indices[0] != indices[1]:
+                        edges += [indices]
                 polygons += [[center, edges]]
             
             for i, polygon in enumerate(polygons):
                 center, edges = polygon
                 if center != self.points[0]:
                     continue
-                newedges = []
-                for edge in edges:
-                    for c, e2 in polygons:
-                        if c!=center and edge in e2:
-                            newedges += [edge]
-                            break
+                shared_edges = set([tuple(e2) for c, pol in polygons if c!=center for e2 in pol] + [(e2[1], e2[0]) for c, pol in polygons if c!=center for e2 in pol])
+                newedges = [edge for edge in edges if tuple(edge) in shared_edges]
                 G = Graph(edges)
                 G2 = Graph(newedges)
                 while G2.connected_components_number()>1:
@@ -340,7 +656,7 @@ class FundamentalGroupVoronoi(object):
                     sp = G.shortest_path(v1, v2)
                     edges = [sp[i:i+2] for i in range(len(sp)-1)]
                     for e in edges:
-                        if e not in newedges:
+                        if e not in newedges and list(reversed(e)) not in newedges:
                             newedges += [e]
                             G2.add_edge(e)
                 polygons[i] = [center, newedges]
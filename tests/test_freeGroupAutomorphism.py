@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+pytest.importorskip("lefschetz_family")
+
+from sage.groups.free_group import FreeGroup
+
+from lefschetz_family.freeGroupAutomorphism import FreeGroupAutomorphism
+
+
+def identity(n):
+    return FreeGroupAutomorphism([(i+1,) for i in range(n)])
+
+def elementary(n, i, j, e, right):
+    """The Nielsen automorphism multiplying the generator i by the generator j**e, on the right or on the left."""
+    images = [(k+1,) for k in range(n)]
+    images[i-1] = (i, e*j) if right else (e*j, i)
+    return FreeGroupAutomorphism(images)
+
+def test_inverse_of_transvection():
+    phi = FreeGroupAutomorphism([(1, 2), (2,)])
+    assert phi.inverse() == FreeGroupAutomorphism([(1, -2), (2,)])
+
+def test_inverse_of_braid_action():
+    phi = FreeGroupAutomorphism([(1, 2, -1), (1,), (3,)])
+    inverse = phi.inverse()
+    assert inverse is not None
+    assert phi * inverse == identity(3)
+    assert inverse * phi == identity(3)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_inverse_of_products(seed):
+    random.seed(seed)
+    n = 4
+    phi = identity(n)
+    for k in range(8):
+        i, j = random.sample(range(1, n+1), 2)
+        phi = phi * elementary(n, i, j, random.choice([1, -1]), random.choice([True, False]))
+    inverse = phi.inverse()
+    assert inverse is not None
+    assert phi * inverse == identity(n)
+    assert inverse * phi == identity(n)
+
+def test_inverse_of_non_automorphism():
+    assert FreeGroupAutomorphism([(1, 1), (2,)]).inverse() is None
+
+@pytest.mark.parametrize("seed", range(5))
+def test_composition_matches_free_group_morphisms(seed):
+    random.seed(seed)
+    n = 3
+    F = FreeGroup(n)
+    phis = []
+    for k in range(2):
+        phi = identity(n)
+        for l in range(4):
+            i, j = random.sample(range(1, n+1), 2)
+            phi = phi * elementary(n, i, j, random.choice([1, -1]), random.choice([True, False]))
+        phis += [phi]
+    phi, psi = phis
+    composed = phi.to_hom(F) * psi.to_hom(F)
+    assert FreeGroupAutomorphism.from_hom(composed) == phi * psi
+    w = (1, -2, 3, 3, -1)
+    assert (phi * psi)(w) == phi(psi(w))
+    assert F(list((phi * psi)(w))) == composed(F(list(w)))
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+pytest.importorskip("lefschetz_family")
+
+from sage.matrix.constructor import matrix
+from sage.modules.free_module_element import vector
+from sage.rings.integer_ring import ZZ
+
+from lefschetz_family.monodromyRepresentation import MonodromyRepresentation
+
+
+def infinity_loops_by_solving(monodromy_representation):
+    """The infinity loops, computed by solving a linear system for each basis vector and each monodromy matrix."""
+    infinity_cycles = []
+    dim = monodromy_representation.dim
+    for i in range(dim):
+        v = vector([1 if k==i else 0 for k in range(dim)])
+        coefs = []
+        for j, M in enumerate(monodromy_representation.monodromy_matrices):
+            if len(monodromy_representation.permuting_cycles[j])==0:
+                continue
+            coefs += list(matrix([(M-1) * t for t in monodromy_representation.permuting_cycles[j]]).solve_left((M-1) * v))
+            v = M*v
+        infinity_cycles += [vector(coefs)]
+    return matrix(infinity_cycles).change_ring(ZZ).rows()
+
+def test_rank_one_monodromy():
+    M = matrix(ZZ, [[1, 2], [0, 1]])
+    N = matrix(ZZ, [[2, -1], [1, 0]])
+    monodromy_representation = MonodromyRepresentation([M, M.inverse(), N, N.inverse()], matrix(ZZ, [[0, 1], [-1, 0]]))
+    for A, permuting_cycles in zip(monodromy_representation.monodromy_matrices, monodromy_representation.permuting_cycles):
+        assert len(permuting_cycles) == 1
+        assert matrix([(A-1)*p for p in permuting_cycles]).row_module() == (A-1).column_module()
+    assert monodromy_representation.infinity_loops == infinity_loops_by_solving(monodromy_representation)
+
+def intersection_product_per_entry(vs, ds, loops, IP):
+    """The intersection product of thimbles, computed entry by entry."""
+    r = len(vs)
+    res = matrix(ZZ, r)
+    for i in range(r):
+        for j in range(r):
+            if loops[i] == loops[j]:
+                res[i, j] = -vs[i]*IP*ds[j]
+            elif loops[i] < loops[j]:
+                res[i, j] = ds[i]*IP*ds[j]
+    return res
+
+@pytest.mark.parametrize("loops", [[0, 1, 2, 3], [0, 0, 1, 2, 2, 2], [1, 1, 1], [0, 2, 2, 5]])
+def test_assemble_intersection_product_thimbles(loops):
+    random.seed(len(loops))
+    M = matrix(ZZ, [[1, 1], [0, 1]])
+    IP = matrix(ZZ, [[0, 1], [-1, 0]])
+    monodromy_representation = MonodromyRepresentation([M, M.inverse()], IP)
+    vs = [vector(ZZ, [random.randint(-5, 5) for k in range(2)]) for l in loops]
+    ds = [vector(ZZ, [random.randint(-5, 5) for k in range(2)]) for l in loops]
+    res = monodromy_representation._assemble_intersection_product_thimbles(vs, ds, loops)
+    assert res == intersection_product_per_entry(vs, ds, loops, IP)
+
+def test_assemble_intersection_product_thimbles_unsorted():
+    M = matrix(ZZ, [[1, 1], [0, 1]])
+    monodromy_representation = MonodromyRepresentation([M, M.inverse()], matrix(ZZ, [[0, 1], [-1, 0]]))
+    vs = [vector(ZZ, [1, 0]), vector(ZZ, [0, 1])]
+    with pytest.raises(AssertionError):
+        monodromy_representation._assemble_intersection_product_thimbles(vs, vs, [1, 0])
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+pytest.importorskip("lefschetz_family")
+
+from sage.arith.functions import lcm
+from sage.arith.misc import gcd
+from sage.matrix.constructor import matrix
+from sage.matrix.special import identity_matrix
+from sage.modules.free_module_element import vector
+from sage.rings.complex_mpfr import ComplexField
+from sage.rings.imaginary_unit import I
+from sage.rings.integer_ring import ZZ
+from sage.rings.rational_field import QQ
+
+from lefschetz_family.util import Util
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_select_closest_indices(seed):
+    random.seed(seed)
+    l = [QQ(random.randint(-100, 100))/7 + I*QQ(random.randint(-100, 100))/11 for k in range(20)]
+    es = [QQ(random.randint(-100, 100))/13 + I*QQ(random.randint(-100, 100))/17 for k in range(50)]
+    assert Util.select_closest_indices(l, es) == [Util.select_closest_index(l, e) for e in es]
+
+def test_select_closest_indices_ambiguous():
+    # both distances round to 1/2 in double precision, only the exact comparison tells them apart
+    l = [QQ(0), 1 + QQ(10)**-20]
+    assert Util.select_closest_indices(l, [QQ(1)/2 + QQ(10)**-30, QQ(1)/2 + QQ(10)**-20]) == [0, 1]
+
+def test_are_clockwise():
+    square = [QQ(0), QQ(1), 1+I, I]
+    assert Util.are_clockwise([square, square[::-1]]) == [False, True]
+
+def test_are_clockwise_ambiguous(monkeypatch):
+    calls = []
+    is_clockwise = Util.is_clockwise
+    def recorded(l):
+        calls.append(l)
+        return is_clockwise(l)
+    monkeypatch.setattr(Util, "is_clockwise", staticmethod(recorded))
+    CC = ComplexField(500)
+    triangle = [CC(0), CC(1), CC(1/2, 10**-30)]
+    assert Util.are_clockwise([triangle, triangle[::-1]]) == [False, True]
+    assert len(calls) == 2
+
+def test_transvection():
+    v, w = vector(ZZ, [2, -3, 0]), vector(ZZ, [1, 4, -2])
+    M = identity_matrix(ZZ, 3) + v.column()*w.row()
+    v2, w2 = Util.transvection(M)
+    assert gcd(v2.list()) == 1
+    assert v2.column()*w2.row() == M - 1
+    assert v2 in [v, -v]
+
+def test_transvection_of_non_primitive_vector():
+    v, w = vector(ZZ, [2, 4]), vector(ZZ, [1, 0])
+    v2, w2 = Util.transvection(identity_matrix(ZZ, 2) + v.column()*w.row())
+    assert v2 in [v/2, -v/2]
+    assert w2 in [2*w, -2*w]
+
+def test_transvection_of_identity():
+    assert Util.transvection(identity_matrix(ZZ, 3)) is None
+
+def test_transvection_of_rank_two():
+    assert Util.transvection(matrix(ZZ, [[2, 0], [0, 2]])) is None
+
+@pytest.mark.parametrize("w", [[6, 10, 15], [0, 4, 6], [0, 0, -3], [7]])
+def test_bezout_vector(w):
+    w = vector(ZZ, w)
+    p = Util.bezout_vector(w)
+    assert w*p == gcd(w.list())
+
+
+def saturate_by_echelon_form(Ms):
+    """The saturation, computed by taking the echelon form of the whole basis whenever a vector is added."""
+    dim = Ms[0].nrows()
+    B = identity_matrix(QQ, dim)
+    queue = identity_matrix(QQ, dim).rows()
+    while len(queue)>0:
+        v = queue.pop()
+        for M in Ms:
+            w = M*v
+            if all([c in ZZ for c in w*B.inverse()]):
+                continue
+            d = lcm(B.denominator(), w.denominator())
+            B = (d*B.stack(w)).change_ring(ZZ).echelon_form()[:dim].change_ring(QQ)/d
+            queue += [w]
+    return identity_matrix(dim).image().span(B.rows()).basis_matrix().transpose()
+
+@pytest.mark.parametrize("P", [
+    [[1, 0], [0, 2]],
+    [[2, 1], [0, 3]],
+    [[1, 2, 0], [0, 6, 1], [1, 0, 4]],
+    [[4, 0, 0], [0, 9, 0], [0, 0, 5]],
+])
+def test_saturate(P):
+    P = matrix(QQ, P)
+    As = [matrix(ZZ, [[1, 1], [0, 1]]), matrix(ZZ, [[0, -1], [1, 0]])] if P.nrows() == 2 else [matrix(ZZ, [[1, 1, 0], [0, 1, 0], [0, 0, 1]]), matrix(ZZ, [[0, 0, 1], [1, 0, 0], [0, 1, 0]])]
+    Ms = [P.inverse()*A*P for A in As]
+    CB = Util.saturate(Ms)
+    assert CB.inverse() in CB.inverse().parent().change_ring(ZZ)
+    for M in Ms:
+        assert CB.inverse()*M*CB in M.parent().change_ring(ZZ)
+    assert CB == saturate_by_echelon_form(Ms)
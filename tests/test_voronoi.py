@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+pytest.importorskip("lefschetz_family")
+
+from sage.rings.imaginary_unit import I
+from sage.rings.complex_mpfr import ComplexField
+from sage.rings.rational_field import QQ
+
+from lefschetz_family.voronoi import FundamentalGroupVoronoi
+
+
+CC = ComplexField(53)
+
+
+def random_points(n, seed, size=10):
+    """Random points in general position in the square of side 2*size centered at 0."""
+    random.seed(seed)
+    points = []
+    while len(points) < n:
+        z = QQ(random.randint(-10**5, 10**5))*size/10**5 + I*QQ(random.randint(-10**5, 10**5))*size/10**5
+        if z not in points and z != 0:
+            points += [z]
+    return points
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sort_loops_is_permutation(seed):
+    points = random_points(30, seed)
+    fg = FundamentalGroupVoronoi(points, QQ(0))
+    order = fg.sort_loops()
+    assert sorted(order) == list(range(len(points)))
+    assert fg.points[1:] == [points[i] for i in order]
+    assert len(fg.loops) == len(points) and len(fg.paths) == len(points)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_updated_duality(seed):
+    points = random_points(40, seed)
+    # the added points are not closer to the others than the original points, so that the rational approximations can be kept
+    sites = [QQ(0)] + points
+    distance = min([abs(CC(z1-z2)) for i, z1 in enumerate(sites) for z2 in sites[:i]])
+    added = []
+    for z in random_points(20, seed+100, size=5):
+        if len(added) < 3 and min([abs(CC(z-z2)) for z2 in sites + added]) > 2*distance:
+            added += [z]
+    fg = FundamentalGroupVoronoi(points, QQ(0))
+    fg.pointed_loops
+    # the added points also lie within the others, so that only the cells around the modified points are computed again
+    fg2, changed_edges = fg.updated(added=added, removed=points[:2])
+    assert hasattr(fg2, "_updated_cells")
+    assert fg2.points[1:] == points[2:] + added
+    # every edge between two cells is dual to the segment between their centers
+    duality = fg2.duality
+    assert len(duality) % 2 == 0
+    for e, d in duality:
+        assert len(d) == 2
+        assert e in fg2.edges or list(reversed(e)) in fg2.edges
+    assert len(fg2.pointed_loops) == len(points) - 2 + len(added)